@@ -1,13 +1,17 @@
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from pydantic import BaseModel
+from contextlib import asynccontextmanager
 from typing import List, Dict, Optional
 import uvicorn
+import importlib.util
 import threading
 import time
 
 from blockchain.core import Blockchain, Transaction
-from wallet.wallet import Wallet, WalletManager
+from wallet.wallet import Wallet, WalletManager, KEY_TYPES
 from data_engine.data_converter import DataConverter, DEFAULT_DATA_SOURCES
 
 # Pydantic models for API requests/responses
@@ -18,6 +22,7 @@ class TransactionCreate(BaseModel):
 
 class WalletCreate(BaseModel):
     wallet_name: str
+    key_type: str = "ed25519"
 
 class DataSourceCreate(BaseModel):
     source_id: str
@@ -55,11 +60,21 @@ class BlockchainStats(BaseModel):
     corporate_shares: Dict[str, int]
     pending_transactions: int
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Release pooled connections and wallet databases when the server stops"""
+    yield
+    data_converter.close()
+    wallet_manager.close()
+
 # Initialize the digital currency system
 app = FastAPI(
     title="DataCoin API",
     description="RESTful API for DataCoin - A digital currency powered by internet data",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson serializes several times faster than the stdlib encoder when it is installed
+    default_response_class=ORJSONResponse if importlib.util.find_spec("orjson") else JSONResponse,
+    lifespan=lifespan
 )
 
 # Enable CORS
@@ -71,6 +86,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger payloads (block lists, histories); small responses are not worth it
+app.add_middleware(GZipMiddleware, minimum_size=1024)
+
 # Global instances
 blockchain = Blockchain()
 wallet_manager = WalletManager()
@@ -102,6 +120,10 @@ def background_mining():
             print(f"Mining error: {e}")
             time.sleep(60)
 
+# Handlers that touch SQLite, the network, key generation or proof-of-work are
+# plain `def` so FastAPI runs them in its threadpool; `async def` is reserved for
+# handlers that only read in-memory state and never block the event loop.
+
 # Blockchain endpoints
 @app.get("/", response_model=Dict)
 async def root():
@@ -112,7 +134,7 @@ async def root():
         "description": "A digital currency powered by internet data conversion",
         "features": [
             "Blockchain with proof-of-work mining",
-            "Wallet management with RSA encryption", 
+            "Wallet management with Ed25519 keys", 
             "Internet data to currency conversion",
             "Corporate share-based mining regulation",
             "Real-time transaction processing"
@@ -146,9 +168,9 @@ async def get_block(block_index: int):
     return blockchain.chain[block_index].to_dict()
 
 @app.get("/blockchain/validate")
-async def validate_blockchain():
+def validate_blockchain():
     """Validate the entire blockchain"""
-    is_valid = blockchain.is_chain_valid()
+    is_valid = blockchain.is_chain_valid(full=True)
     return {"valid": is_valid}
 
 @app.get("/blockchain/pending")
@@ -158,25 +180,28 @@ async def get_pending_transactions():
 
 # Wallet endpoints
 @app.post("/wallets/create", response_model=WalletResponse)
-async def create_wallet(wallet_data: WalletCreate):
+def create_wallet(wallet_data: WalletCreate):
     """Create a new wallet"""
-    wallet = wallet_manager.create_wallet(wallet_data.wallet_name)
+    if wallet_data.key_type not in KEY_TYPES:
+        raise HTTPException(status_code=400, detail="Unsupported key type")
+    
+    wallet = wallet_manager.create_wallet(wallet_data.wallet_name, wallet_data.key_type)
     wallet.connect_to_blockchain(blockchain)
     
     return WalletResponse(
         wallet_name=wallet.wallet_name,
         address=wallet.address,
         balance=wallet.get_balance(),
-        transaction_count=len(wallet.get_transaction_history())
+        transaction_count=wallet.count_transactions()
     )
 
 @app.get("/wallets", response_model=List[str])
-async def list_wallets():
+def list_wallets():
     """List all available wallets"""
     return wallet_manager.list_wallets()
 
 @app.get("/wallets/{wallet_name}", response_model=WalletResponse)
-async def get_wallet(wallet_name: str):
+def get_wallet(wallet_name: str):
     """Get wallet information"""
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
@@ -188,11 +213,11 @@ async def get_wallet(wallet_name: str):
         wallet_name=wallet.wallet_name,
         address=wallet.address,
         balance=wallet.get_balance(),
-        transaction_count=len(wallet.get_transaction_history())
+        transaction_count=wallet.count_transactions()
     )
 
 @app.get("/wallets/{wallet_name}/balance")
-async def get_wallet_balance(wallet_name: str):
+def get_wallet_balance(wallet_name: str):
     """Get wallet balance"""
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
@@ -202,16 +227,19 @@ async def get_wallet_balance(wallet_name: str):
     return {"balance": wallet.get_balance()}
 
 @app.get("/wallets/{wallet_name}/transactions")
-async def get_wallet_transactions(wallet_name: str):
-    """Get wallet transaction history"""
+def get_wallet_transactions(wallet_name: str, limit: Optional[int] = None, offset: int = 0):
+    """Get wallet transaction history, newest first; use limit/offset to page"""
+    if (limit is not None and limit < 0) or offset < 0:
+        raise HTTPException(status_code=400, detail="limit and offset must be non-negative")
+    
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
         raise HTTPException(status_code=404, detail="Wallet not found")
     
-    return wallet.get_transaction_history()
+    return wallet.get_transaction_history(limit, offset)
 
 @app.get("/wallets/{wallet_name}/stats")
-async def get_wallet_stats(wallet_name: str):
+def get_wallet_stats(wallet_name: str):
     """Get comprehensive wallet statistics"""
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
@@ -221,7 +249,7 @@ async def get_wallet_stats(wallet_name: str):
     return wallet.get_wallet_stats()
 
 @app.post("/wallets/{wallet_name}/transaction", response_model=TransactionResponse)
-async def create_transaction(wallet_name: str, transaction_data: TransactionCreate):
+def create_transaction(wallet_name: str, transaction_data: TransactionCreate):
     """Create a new transaction"""
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
@@ -241,7 +269,7 @@ async def create_transaction(wallet_name: str, transaction_data: TransactionCrea
     return TransactionResponse(**transaction.to_dict())
 
 @app.post("/wallets/{wallet_name}/shares")
-async def buy_corporate_shares(wallet_name: str, share_data: SharePurchase):
+def buy_corporate_shares(wallet_name: str, share_data: SharePurchase):
     """Buy corporate shares to influence mining regulation"""
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
@@ -263,7 +291,7 @@ async def buy_corporate_shares(wallet_name: str, share_data: SharePurchase):
 
 # Mining endpoints
 @app.post("/mining/start/{wallet_name}")
-async def start_mining(wallet_name: str, background_tasks: BackgroundTasks):
+def start_mining(wallet_name: str, background_tasks: BackgroundTasks):
     """Start mining with specified wallet"""
     global mining_active, mining_thread
     
@@ -301,7 +329,7 @@ async def get_mining_status():
     }
 
 @app.post("/mining/mine/{wallet_name}")
-async def mine_single_block(wallet_name: str):
+def mine_single_block(wallet_name: str):
     """Mine a single block"""
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
@@ -330,7 +358,7 @@ async def get_data_sources():
     return data_converter.get_source_list()
 
 @app.post("/data/sources")
-async def add_data_source(source_data: DataSourceCreate):
+def add_data_source(source_data: DataSourceCreate):
     """Add a new data source"""
     success = data_converter.add_data_source(
         source_data.source_id,
@@ -345,7 +373,7 @@ async def add_data_source(source_data: DataSourceCreate):
     return {"success": True, "source_id": source_data.source_id}
 
 @app.post("/data/convert/{wallet_name}")
-async def convert_data_manual(wallet_name: str, conversion_data: DataConversion):
+def convert_data_manual(wallet_name: str, conversion_data: DataConversion):
     """Manually convert data to currency"""
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
@@ -361,7 +389,7 @@ async def convert_data_manual(wallet_name: str, conversion_data: DataConversion)
     return TransactionResponse(**transaction.to_dict())
 
 @app.post("/data/collect/{source_id}/{wallet_name}")
-async def collect_from_source(source_id: str, wallet_name: str):
+def collect_from_source(source_id: str, wallet_name: str):
     """Collect data from specific source and convert to currency"""
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
@@ -377,7 +405,7 @@ async def collect_from_source(source_id: str, wallet_name: str):
     return TransactionResponse(**transaction.to_dict())
 
 @app.post("/data/auto-convert/start/{wallet_name}")
-async def start_auto_conversion(wallet_name: str, interval_minutes: int = 60):
+def start_auto_conversion(wallet_name: str, interval_minutes: int = 60):
     """Start automatic data conversion"""
     wallet = wallet_manager.load_wallet(wallet_name)
     if not wallet:
@@ -391,13 +419,13 @@ async def start_auto_conversion(wallet_name: str, interval_minutes: int = 60):
     }
 
 @app.post("/data/auto-convert/stop")
-async def stop_auto_conversion():
+def stop_auto_conversion():
     """Stop automatic data conversion"""
     data_converter.stop_auto_conversion()
     return {"message": "Auto conversion stopped"}
 
 @app.get("/data/stats")
-async def get_conversion_stats():
+def get_conversion_stats():
     """Get data conversion statistics"""
     return data_converter.get_conversion_stats()
 
@@ -407,6 +435,17 @@ async def get_corporate_shares():
     """Get current corporate share ownership"""
     return blockchain.corporate_shares
 
+@app.get("/corporate/shares/{company}/holders")
+async def get_major_shareholders(company: str, limit: int = 10):
+    """Get the largest shareholders of a company"""
+    if company not in blockchain.corporate_shares:
+        raise HTTPException(status_code=404, detail="Company not found")
+    
+    return [
+        {"address": address, "shares": shares}
+        for address, shares in blockchain.get_major_shareholders(company, limit)
+    ]
+
 @app.post("/corporate/adjust-difficulty")
 async def adjust_mining_difficulty():
     """Manually adjust mining difficulty based on corporate shares"""
@@ -422,13 +461,13 @@ async def adjust_mining_difficulty():
 
 # System control endpoints
 @app.post("/system/reset")
-async def reset_system():
+def reset_system():
     """Reset the entire system (for development/testing)"""
     global blockchain, data_converter, mining_active
     
-    # Stop any running processes
+    # Stop any running processes; close() also releases the old converter's HTTP pool
     mining_active = False
-    data_converter.stop_auto_conversion()
+    data_converter.close()
     
     # Recreate blockchain
     blockchain = Blockchain()
@@ -441,7 +480,7 @@ async def reset_system():
     return {"message": "System reset successfully"}
 
 @app.get("/system/health")
-async def health_check():
+def health_check():
     """System health check"""
     return {
         "status": "healthy",
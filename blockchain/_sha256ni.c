@@ -0,0 +1,420 @@
+/*
+ * Native proof-of-work nonce search
+ *
+ * Same contract as blockchain.mining.mine_range:
+ *
+ *     mine_range(prefix, suffix, start, count, difficulty) -> nonce or -1
+ *
+ * The whole 64-byte blocks of the prefix are compressed once (midstate);
+ * each nonce only re-hashes the tail, whose decimal digits are incremented
+ * in place. Compression uses the x86 SHA extensions (detected with CPUID at
+ * runtime) or the ARMv8 SHA-256 instructions (detected with HWCAP on Linux,
+ * assumed when the compiler already targets them), and portable C
+ * otherwise. The search runs without the GIL.
+ */
+
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#include <stdint.h>
+#include <stdlib.h>
+#include <string.h>
+
+#if (defined(__x86_64__) || defined(__i386__)) && (defined(__GNUC__) || defined(__clang__))
+#define HAVE_X86_SHA 1
+#include <cpuid.h>
+#include <immintrin.h>
+#endif
+
+#if defined(__aarch64__) && (defined(__ARM_FEATURE_SHA2) || defined(__ARM_FEATURE_CRYPTO))
+/* The compiler already targets the SHA-256 instructions */
+#define HAVE_ARM_SHA 1
+#define ARM_SHA_TARGET
+#elif defined(__aarch64__) && defined(__linux__) && defined(__GNUC__) && !defined(__clang__)
+/* Default aarch64 GCC does not: build only the compress routine for +crypto
+ * and check HWCAP before selecting it */
+#define HAVE_ARM_SHA 1
+#define ARM_SHA_HWCAP 1
+#define ARM_SHA_TARGET __attribute__((target("+crypto")))
+#include <sys/auxv.h>
+#ifndef HWCAP_SHA2
+#define HWCAP_SHA2 (1 << 6)
+#endif
+#endif
+
+#ifdef HAVE_ARM_SHA
+#include <arm_neon.h>
+#endif
+
+#define MAX_DIGITS 20
+
+typedef void (*compress_fn)(uint32_t state[8], const uint8_t *data, size_t blocks);
+
+static const uint32_t K256[64] = {
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+};
+
+static const uint32_t H0[8] = {
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+};
+
+/* Portable compression */
+
+#define ROTR(x, n) (((x) >> (n)) | ((x) << (32 - (n))))
+
+static void compress_portable(uint32_t state[8], const uint8_t *data, size_t blocks)
+{
+    uint32_t w[64];
+    int i;
+
+    while (blocks--) {
+        uint32_t a = state[0], b = state[1], c = state[2], d = state[3];
+        uint32_t e = state[4], f = state[5], g = state[6], h = state[7];
+
+        for (i = 0; i < 16; i++) {
+            w[i] = ((uint32_t)data[4 * i] << 24) | ((uint32_t)data[4 * i + 1] << 16)
+                 | ((uint32_t)data[4 * i + 2] << 8) | (uint32_t)data[4 * i + 3];
+        }
+        for (i = 16; i < 64; i++) {
+            uint32_t s0 = ROTR(w[i - 15], 7) ^ ROTR(w[i - 15], 18) ^ (w[i - 15] >> 3);
+            uint32_t s1 = ROTR(w[i - 2], 17) ^ ROTR(w[i - 2], 19) ^ (w[i - 2] >> 10);
+            w[i] = w[i - 16] + s0 + w[i - 7] + s1;
+        }
+
+        for (i = 0; i < 64; i++) {
+            uint32_t s1 = ROTR(e, 6) ^ ROTR(e, 11) ^ ROTR(e, 25);
+            uint32_t ch = (e & f) ^ (~e & g);
+            uint32_t t1 = h + s1 + ch + K256[i] + w[i];
+            uint32_t s0 = ROTR(a, 2) ^ ROTR(a, 13) ^ ROTR(a, 22);
+            uint32_t maj = (a & b) ^ (a & c) ^ (b & c);
+            uint32_t t2 = s0 + maj;
+            h = g;
+            g = f;
+            f = e;
+            e = d + t1;
+            d = c;
+            c = b;
+            b = a;
+            a = t1 + t2;
+        }
+
+        state[0] += a;
+        state[1] += b;
+        state[2] += c;
+        state[3] += d;
+        state[4] += e;
+        state[5] += f;
+        state[6] += g;
+        state[7] += h;
+        data += 64;
+    }
+}
+
+/* x86 SHA extensions */
+
+#ifdef HAVE_X86_SHA
+
+/* Four rounds on message words Mi; Mi + K is left in MSG for the second half */
+#define SHANI_RNDS(Mi, group)                                                       \
+    MSG = _mm_add_epi32(Mi, _mm_loadu_si128((const __m128i *)&K256[4 * (group)])); \
+    STATE1 = _mm_sha256rnds2_epu32(STATE1, STATE0, MSG)
+
+#define SHANI_RNDS_END                         \
+    MSG = _mm_shuffle_epi32(MSG, 0x0E);        \
+    STATE0 = _mm_sha256rnds2_epu32(STATE0, STATE1, MSG)
+
+#define SHANI_MSG2(Mnext, Mi, Mprev)           \
+    TMP = _mm_alignr_epi8(Mi, Mprev, 4);       \
+    Mnext = _mm_add_epi32(Mnext, TMP);         \
+    Mnext = _mm_sha256msg2_epu32(Mnext, Mi)
+
+#define SHANI_MSG1(Mprev, Mi) Mprev = _mm_sha256msg1_epu32(Mprev, Mi)
+
+__attribute__((target("sha,sse4.1,ssse3")))
+static void compress_shani(uint32_t state[8], const uint8_t *data, size_t blocks)
+{
+    const __m128i MASK = _mm_set_epi64x(0x0c0d0e0f08090a0bULL, 0x0405060700010203ULL);
+    __m128i STATE0, STATE1, MSG, TMP, M0, M1, M2, M3, ABEF_SAVE, CDGH_SAVE;
+
+    /* Reorder ABCD EFGH into the ABEF CDGH layout the instructions expect */
+    TMP = _mm_loadu_si128((const __m128i *)&state[0]);
+    STATE1 = _mm_loadu_si128((const __m128i *)&state[4]);
+    TMP = _mm_shuffle_epi32(TMP, 0xB1);
+    STATE1 = _mm_shuffle_epi32(STATE1, 0x1B);
+    STATE0 = _mm_alignr_epi8(TMP, STATE1, 8);
+    STATE1 = _mm_blend_epi16(STATE1, TMP, 0xF0);
+
+    while (blocks--) {
+        ABEF_SAVE = STATE0;
+        CDGH_SAVE = STATE1;
+
+        M0 = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(data + 0)), MASK);
+        M1 = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(data + 16)), MASK);
+        M2 = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(data + 32)), MASK);
+        M3 = _mm_shuffle_epi8(_mm_loadu_si128((const __m128i *)(data + 48)), MASK);
+
+        SHANI_RNDS(M0, 0);  SHANI_RNDS_END;
+        SHANI_RNDS(M1, 1);  SHANI_RNDS_END;                            SHANI_MSG1(M0, M1);
+        SHANI_RNDS(M2, 2);  SHANI_RNDS_END;                            SHANI_MSG1(M1, M2);
+        SHANI_RNDS(M3, 3);  SHANI_MSG2(M0, M3, M2); SHANI_RNDS_END;    SHANI_MSG1(M2, M3);
+        SHANI_RNDS(M0, 4);  SHANI_MSG2(M1, M0, M3); SHANI_RNDS_END;    SHANI_MSG1(M3, M0);
+        SHANI_RNDS(M1, 5);  SHANI_MSG2(M2, M1, M0); SHANI_RNDS_END;    SHANI_MSG1(M0, M1);
+        SHANI_RNDS(M2, 6);  SHANI_MSG2(M3, M2, M1); SHANI_RNDS_END;    SHANI_MSG1(M1, M2);
+        SHANI_RNDS(M3, 7);  SHANI_MSG2(M0, M3, M2); SHANI_RNDS_END;    SHANI_MSG1(M2, M3);
+        SHANI_RNDS(M0, 8);  SHANI_MSG2(M1, M0, M3); SHANI_RNDS_END;    SHANI_MSG1(M3, M0);
+        SHANI_RNDS(M1, 9);  SHANI_MSG2(M2, M1, M0); SHANI_RNDS_END;    SHANI_MSG1(M0, M1);
+        SHANI_RNDS(M2, 10); SHANI_MSG2(M3, M2, M1); SHANI_RNDS_END;    SHANI_MSG1(M1, M2);
+        SHANI_RNDS(M3, 11); SHANI_MSG2(M0, M3, M2); SHANI_RNDS_END;    SHANI_MSG1(M2, M3);
+        SHANI_RNDS(M0, 12); SHANI_MSG2(M1, M0, M3); SHANI_RNDS_END;    SHANI_MSG1(M3, M0);
+        SHANI_RNDS(M1, 13); SHANI_MSG2(M2, M1, M0); SHANI_RNDS_END;
+        SHANI_RNDS(M2, 14); SHANI_MSG2(M3, M2, M1); SHANI_RNDS_END;
+        SHANI_RNDS(M3, 15); SHANI_RNDS_END;
+
+        STATE0 = _mm_add_epi32(STATE0, ABEF_SAVE);
+        STATE1 = _mm_add_epi32(STATE1, CDGH_SAVE);
+        data += 64;
+    }
+
+    /* Back to ABCD EFGH */
+    TMP = _mm_shuffle_epi32(STATE0, 0x1B);
+    STATE1 = _mm_shuffle_epi32(STATE1, 0xB1);
+    STATE0 = _mm_blend_epi16(TMP, STATE1, 0xF0);
+    STATE1 = _mm_alignr_epi8(STATE1, TMP, 8);
+    _mm_storeu_si128((__m128i *)&state[0], STATE0);
+    _mm_storeu_si128((__m128i *)&state[4], STATE1);
+}
+
+static int cpu_has_sha(void)
+{
+    unsigned int eax, ebx, ecx, edx;
+
+    if (!__get_cpuid(1, &eax, &ebx, &ecx, &edx))
+        return 0;
+    if (!(ecx & (1u << 9)) || !(ecx & (1u << 19)))  /* SSSE3, SSE4.1 */
+        return 0;
+    if (__get_cpuid_max(0, NULL) < 7)
+        return 0;
+    __cpuid_count(7, 0, eax, ebx, ecx, edx);
+    return (ebx & (1u << 29)) != 0;  /* SHA */
+}
+
+#endif /* HAVE_X86_SHA */
+
+/* ARMv8 SHA-256 instructions */
+
+#ifdef HAVE_ARM_SHA
+
+ARM_SHA_TARGET
+static void compress_armv8(uint32_t state[8], const uint8_t *data, size_t blocks)
+{
+    uint32x4_t STATE0 = vld1q_u32(&state[0]);
+    uint32x4_t STATE1 = vld1q_u32(&state[4]);
+    int i;
+
+    while (blocks--) {
+        uint32x4_t ABCD_SAVE = STATE0;
+        uint32x4_t EFGH_SAVE = STATE1;
+        uint32x4_t W[4];
+
+        for (i = 0; i < 4; i++)
+            W[i] = vreinterpretq_u32_u8(vrev32q_u8(vld1q_u8(data + 16 * i)));
+
+        for (i = 0; i < 16; i++) {
+            uint32x4_t wk = vaddq_u32(W[i & 3], vld1q_u32(&K256[4 * i]));
+            uint32x4_t abcd = STATE0;
+            STATE0 = vsha256hq_u32(STATE0, STATE1, wk);
+            STATE1 = vsha256h2q_u32(STATE1, abcd, wk);
+            if (i < 12)
+                W[i & 3] = vsha256su1q_u32(vsha256su0q_u32(W[i & 3], W[(i + 1) & 3]),
+                                           W[(i + 2) & 3], W[(i + 3) & 3]);
+        }
+
+        STATE0 = vaddq_u32(STATE0, ABCD_SAVE);
+        STATE1 = vaddq_u32(STATE1, EFGH_SAVE);
+        data += 64;
+    }
+
+    vst1q_u32(&state[0], STATE0);
+    vst1q_u32(&state[4], STATE1);
+}
+
+static int cpu_has_arm_sha(void)
+{
+#ifdef ARM_SHA_HWCAP
+    return (getauxval(AT_HWCAP) & HWCAP_SHA2) != 0;
+#else
+    return 1;
+#endif
+}
+
+#endif /* HAVE_ARM_SHA */
+
+static compress_fn select_compress(void)
+{
+#ifdef HAVE_X86_SHA
+    if (cpu_has_sha())
+        return compress_shani;
+#endif
+#ifdef HAVE_ARM_SHA
+    if (cpu_has_arm_sha())
+        return compress_armv8;
+#endif
+    return compress_portable;
+}
+
+static compress_fn compress = NULL;
+
+/* Nonce search */
+
+static int has_leading_zero_bits(const uint32_t state[8], int zero_bits)
+{
+    int words = zero_bits / 32;
+    int rest = zero_bits % 32;
+    int i;
+
+    for (i = 0; i < words; i++) {
+        if (state[i])
+            return 0;
+    }
+    return rest == 0 || (state[words] >> (32 - rest)) == 0;
+}
+
+/* Add one to a decimal string in place; returns 0 when it needs another digit */
+static int increment_digits(uint8_t *digits, size_t ndigits)
+{
+    size_t i = ndigits;
+
+    while (i--) {
+        if (digits[i] != '9') {
+            digits[i]++;
+            return 1;
+        }
+        digits[i] = '0';
+    }
+    return 0;
+}
+
+/* Lay out leftover + digits(nonce) + suffix + padding; returns the number of blocks */
+static size_t write_tail(uint8_t *buf, size_t leftover_len, unsigned long long nonce,
+                         size_t *ndigits, const uint8_t *suffix, size_t suffix_len,
+                         size_t prefix_len)
+{
+    char digits[MAX_DIGITS + 1];
+    size_t n, total;
+    unsigned long long bit_len;
+    int i;
+
+    *ndigits = (size_t)snprintf(digits, sizeof(digits), "%llu", nonce);
+    memcpy(buf + leftover_len, digits, *ndigits);
+    n = leftover_len + *ndigits;
+    memcpy(buf + n, suffix, suffix_len);
+    n += suffix_len;
+
+    total = ((n + 8) / 64 + 1) * 64;
+    buf[n] = 0x80;
+    memset(buf + n + 1, 0, total - 8 - (n + 1));
+    bit_len = (unsigned long long)(prefix_len + *ndigits + suffix_len) * 8;
+    for (i = 0; i < 8; i++)
+        buf[total - 1 - i] = (uint8_t)(bit_len >> (8 * i));
+    return total / 64;
+}
+
+static long long search(const uint8_t *prefix, size_t prefix_len,
+                        const uint8_t *suffix, size_t suffix_len,
+                        unsigned long long start, unsigned long long count,
+                        int zero_bits, uint8_t *buf)
+{
+    uint32_t midstate[8], state[8];
+    size_t full = (prefix_len / 64) * 64;
+    size_t leftover_len = prefix_len - full;
+    size_t ndigits = 0, blocks = 0;
+    unsigned long long i;
+
+    memcpy(midstate, H0, sizeof(midstate));
+    compress(midstate, prefix, full / 64);
+    memcpy(buf, prefix + full, leftover_len);
+
+    for (i = 0; i < count; i++) {
+        unsigned long long nonce = start + i;
+
+        /* Re-lay the tail only when the nonce gains a digit */
+        if (i == 0 || !increment_digits(buf + leftover_len, ndigits))
+            blocks = write_tail(buf, leftover_len, nonce, &ndigits, suffix, suffix_len, prefix_len);
+
+        memcpy(state, midstate, sizeof(state));
+        compress(state, buf, blocks);
+        if (has_leading_zero_bits(state, zero_bits))
+            return (long long)nonce;
+    }
+    return -1;
+}
+
+static PyObject *
+mine_range(PyObject *self, PyObject *args)
+{
+    Py_buffer prefix, suffix;
+    long long start, count, result;
+    int difficulty;
+    size_t buf_size;
+    uint8_t *buf;
+
+    if (!PyArg_ParseTuple(args, "y*y*LLi:mine_range", &prefix, &suffix, &start, &count, &difficulty))
+        return NULL;
+
+    if (start < 0 || count < 0 || difficulty < 0 || difficulty > 64) {
+        PyBuffer_Release(&prefix);
+        PyBuffer_Release(&suffix);
+        PyErr_SetString(PyExc_ValueError, "start and count must be non-negative and difficulty in [0, 64]");
+        return NULL;
+    }
+
+    buf_size = ((prefix.len % 64 + MAX_DIGITS + suffix.len + 8) / 64 + 1) * 64;
+    buf = malloc(buf_size);
+    if (buf == NULL) {
+        PyBuffer_Release(&prefix);
+        PyBuffer_Release(&suffix);
+        return PyErr_NoMemory();
+    }
+
+    Py_BEGIN_ALLOW_THREADS
+    result = search(prefix.buf, (size_t)prefix.len, suffix.buf, (size_t)suffix.len,
+                    (unsigned long long)start, (unsigned long long)count, difficulty * 4, buf);
+    Py_END_ALLOW_THREADS
+
+    free(buf);
+    PyBuffer_Release(&prefix);
+    PyBuffer_Release(&suffix);
+    return PyLong_FromLongLong(result);
+}
+
+static PyObject *
+hardware_accelerated(PyObject *self, PyObject *args)
+{
+    return PyBool_FromLong(compress != compress_portable);
+}
+
+static PyMethodDef methods[] = {
+    {"mine_range", mine_range, METH_VARARGS,
+     "mine_range(prefix, suffix, start, count, difficulty) -> lowest winning nonce or -1"},
+    {"hardware_accelerated", hardware_accelerated, METH_NOARGS,
+     "Whether SHA-256 runs on SHA-NI / ARMv8 instructions rather than portable C"},
+    {NULL, NULL, 0, NULL}
+};
+
+static struct PyModuleDef module = {
+    PyModuleDef_HEAD_INIT, "_sha256ni", "Native proof-of-work nonce search", -1, methods
+};
+
+PyMODINIT_FUNC
+PyInit__sha256ni(void)
+{
+    compress = select_compress();
+    return PyModule_Create(&module);
+}
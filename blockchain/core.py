@@ -1,10 +1,14 @@
 import hashlib
+import heapq
 import json
 import time
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import cached_property
+from typing import List, Dict, Optional, Tuple
 import threading
 
+from . import mining
+
 class Transaction:
     def __init__(self, sender: str, recipient: str, amount: float, data_value: float = 0, tx_type: str = "transfer"):
         self.sender = sender
@@ -59,20 +63,45 @@ class Block:
         }, sort_keys=True)
         return hashlib.sha256(block_string.encode()).hexdigest()
     
-    def mine_block(self, difficulty: int) -> None:
+    @cached_property
+    def timestamp_str(self) -> str:
+        """Local-time rendering of the block timestamp, formatted once per block"""
+        return str(datetime.fromtimestamp(self.timestamp))
+    
+    def hash_preimage_parts(self) -> Tuple[bytes, bytes]:
+        """Split the serialized block around the nonce so it can be re-hashed per nonce
+        
+        calculate_hash() hashes prefix + str(nonce) + suffix; sort_keys places
+        'nonce' right after 'index', so everything else is fixed while mining.
+        """
+        head = json.dumps({'index': self.index}, sort_keys=True)
+        tail = json.dumps({
+            'transactions': [tx.to_dict() for tx in self.transactions],
+            'previous_hash': self.previous_hash,
+            'timestamp': self.timestamp
+        }, sort_keys=True)
+        prefix = head[:-1] + ', "nonce": '
+        suffix = ', ' + tail[1:]
+        return prefix.encode(), suffix.encode()
+    
+    def mine_block(self, difficulty: int, backend: str = 'auto', workers: int = 1) -> None:
         """Mine block with proof of work"""
-        target = "0" * difficulty
+        search, batch_size = mining.get_search_backend(backend, workers)
+        prefix, suffix = self.hash_preimage_parts()
         start_time = time.time()
         
-        while self.hash[:difficulty] != target:
-            self.nonce += 1
-            self.hash = self.calculate_hash()
+        while True:
+            nonce = search(prefix, suffix, self.nonce, batch_size, difficulty)
+            if nonce >= 0:
+                self.nonce = nonce
+                break
+            self.nonce += batch_size
             
             # Add mining progress feedback
-            if self.nonce % 10000 == 0:
-                elapsed = time.time() - start_time
-                print(f"Mining block {self.index}... Nonce: {self.nonce}, Time: {elapsed:.2f}s")
+            elapsed = time.time() - start_time
+            print(f"Mining block {self.index}... Nonce: {self.nonce}, Time: {elapsed:.2f}s")
         
+        self.hash = self.calculate_hash()
         print(f"Block {self.index} mined! Hash: {self.hash}")
     
     def to_dict(self) -> Dict:
@@ -91,12 +120,24 @@ class Blockchain:
         self.difficulty = 4  # Mining difficulty
         self.pending_transactions: List[Transaction] = []
         self.mining_reward = 10  # Coins rewarded for mining
+        self.mining_backend = 'auto'  # One of mining.BACKENDS
+        self.mining_workers = 1  # Processes for the single-core mining backends
         self.corporate_shares = {
             'Google': 0,
             'Microsoft': 0,
             'NBC Universal': 0
         }
+        # Per-company holdings by buyer address, kept in step with corporate_shares
+        self.shareholders: Dict[str, Dict[str, int]] = {company: {} for company in self.corporate_shares}
         self.data_conversion_rate = 0.001  # 1 MB = 0.001 coins
+        
+        # Running totals over confirmed blocks, updated as blocks are appended
+        self._balances: Dict[str, float] = {}
+        self._total_transactions = 0
+        self._total_data_converted = 0
+        # Length of the chain prefix already checked by is_chain_valid()
+        self._validated_up_to = 0
+        
         self.create_genesis_block()
         self.lock = threading.Lock()
     
@@ -105,6 +146,17 @@ class Blockchain:
         genesis_transaction = Transaction("genesis", "system", 0, 0, "genesis")
         genesis_block = Block(0, [genesis_transaction], "0")
         self.chain.append(genesis_block)
+        self._index_block(genesis_block)
+        self._validated_up_to = 1
+    
+    def _index_block(self, block: Block) -> None:
+        """Fold a newly appended block into the running balances and statistics"""
+        for transaction in block.transactions:
+            self._balances[transaction.sender] = self._balances.get(transaction.sender, 0) - transaction.amount
+            self._balances[transaction.recipient] = self._balances.get(transaction.recipient, 0) + transaction.amount
+            if transaction.tx_type == "data_conversion":
+                self._total_data_converted += transaction.data_value
+        self._total_transactions += len(block.transactions)
     
     def get_latest_block(self) -> Block:
         """Get the most recent block"""
@@ -128,37 +180,41 @@ class Blockchain:
             0, 
             "mining_reward"
         )
-        self.pending_transactions.append(reward_transaction)
+        
+        # Take the pending transactions so ones added while mining wait for the next block
+        with self.lock:
+            transactions = self.pending_transactions + [reward_transaction]
+            self.pending_transactions = []
         
         # Create new block
         new_block = Block(
             len(self.chain),
-            self.pending_transactions,
+            transactions,
             self.get_latest_block().hash
         )
         
         # Mine the block
-        new_block.mine_block(self.difficulty)
+        try:
+            new_block.mine_block(self.difficulty, self.mining_backend, self.mining_workers)
+        except BaseException:
+            with self.lock:
+                self.pending_transactions[:0] = transactions[:-1]
+            raise
         
-        # Add to chain and clear pending transactions
+        # Add to chain
         with self.lock:
             self.chain.append(new_block)
-            self.pending_transactions = []
+            self._index_block(new_block)
+            
+            # Validate the new block against its predecessor while it is still the tip
+            if self._validated_up_to == len(self.chain) - 1 and self._is_block_linked(len(self.chain) - 1):
+                self._validated_up_to = len(self.chain)
         
         return new_block
     
     def get_balance(self, address: str) -> float:
         """Get balance for a given address"""
-        balance = 0
-        
-        for block in self.chain:
-            for transaction in block.transactions:
-                if transaction.sender == address:
-                    balance -= transaction.amount
-                if transaction.recipient == address:
-                    balance += transaction.amount
-        
-        return balance
+        return self._balances.get(address, 0)
     
     def convert_data_to_currency(self, data_size_mb: float, converter_address: str) -> Transaction:
         """Convert internet data to digital currency"""
@@ -196,9 +252,16 @@ class Blockchain:
             
             self.add_transaction(share_transaction)
             self.corporate_shares[company] += shares
+            holders = self.shareholders[company]
+            holders[buyer_address] = holders.get(buyer_address, 0) + shares
             return True
         return False
     
+    def get_major_shareholders(self, company: str, limit: int = 10) -> List[Tuple[str, int]]:
+        """Get the largest shareholders of a company as (address, shares), largest first"""
+        holders = self.shareholders.get(company, {})
+        return heapq.nlargest(limit, holders.items(), key=lambda holder: holder[1])
+    
     def adjust_mining_difficulty(self) -> None:
         """Adjust mining difficulty based on corporate share ownership"""
         total_shares = sum(self.corporate_shares.values())
@@ -208,36 +271,43 @@ class Blockchain:
         elif total_shares < 100:  # Low corporate control
             self.difficulty = min(6, self.difficulty + 1)  # Harder mining
     
-    def is_chain_valid(self) -> bool:
-        """Validate the entire blockchain"""
-        for i in range(1, len(self.chain)):
-            current_block = self.chain[i]
-            previous_block = self.chain[i - 1]
-            
-            # Check if current block hash is valid
-            if current_block.hash != current_block.calculate_hash():
-                return False
-            
-            # Check if current block references previous block
-            if current_block.previous_hash != previous_block.hash:
+    def _is_block_linked(self, index: int) -> bool:
+        """Check a block's own hash and its link to the previous block"""
+        current_block = self.chain[index]
+        previous_block = self.chain[index - 1]
+        
+        # Check if current block hash is valid
+        if current_block.hash != current_block.calculate_hash():
+            return False
+        
+        # Check if current block references previous block
+        if current_block.previous_hash != previous_block.hash:
+            return False
+        
+        return True
+    
+    def is_chain_valid(self, full: bool = False) -> bool:
+        """Validate the blockchain
+        
+        Blocks are validated as they are mined, so by default only blocks not yet
+        checked are re-hashed; full=True re-validates the entire chain.
+        """
+        start = 1 if full else self._validated_up_to
+        for i in range(start, len(self.chain)):
+            if not self._is_block_linked(i):
+                self._validated_up_to = i
                 return False
         
+        self._validated_up_to = len(self.chain)
         return True
     
     def get_blockchain_stats(self) -> Dict:
         """Get comprehensive blockchain statistics"""
-        total_transactions = sum(len(block.transactions) for block in self.chain)
-        total_data_converted = sum(
-            tx.data_value for block in self.chain 
-            for tx in block.transactions 
-            if tx.tx_type == "data_conversion"
-        )
-        
         return {
             'total_blocks': len(self.chain),
-            'total_transactions': total_transactions,
+            'total_transactions': self._total_transactions,
             'current_difficulty': self.difficulty,
-            'total_data_converted_mb': total_data_converted,
+            'total_data_converted_mb': self._total_data_converted,
             'corporate_shares': self.corporate_shares,
             'pending_transactions': len(self.pending_transactions)
         }
\ No newline at end of file
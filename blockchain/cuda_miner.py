@@ -0,0 +1,173 @@
+"""
+CUDA proof-of-work nonce search
+
+Each GPU thread hashes HASHES_PER_THREAD consecutive nonces. The prefix
+midstate is computed once on the host; threads stream the remaining tail
+bytes (leftover prefix, decimal nonce, suffix, padding) straight from
+device memory, so blocks with arbitrarily many transactions fit. The
+lowest winning nonce is published with an atomic min.
+
+Importing this module raises ImportError when Numba is not installed;
+use is_available() to check for a usable GPU.
+"""
+
+from typing import Optional
+
+import numpy as np
+from numba import cuda, int64, uint8
+
+from .numba_miner import _K, _midstate
+
+THREADS_PER_BLOCK = 384
+HASHES_PER_THREAD = 96
+BLOCKS_PER_LAUNCH = 256
+BATCH_SIZE = THREADS_PER_BLOCK * HASHES_PER_THREAD * BLOCKS_PER_LAUNCH
+
+_MASK = 0xFFFFFFFF
+_NOT_FOUND = np.iinfo(np.int64).max
+
+def is_available() -> bool:
+    """Check whether a CUDA device can be used for mining"""
+    try:
+        return cuda.is_available()
+    except Exception:
+        return False
+
+@cuda.jit(device=True, inline=True)
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & _MASK
+
+@cuda.jit(device=True)
+def _tail_byte(pos, leftover, digits, ndigits, suffix, tail_len, total, bit_len):
+    """Byte `pos` of the padded tail: leftover + digits + suffix + 0x80 + zeros + length"""
+    if pos < leftover.shape[0]:
+        return int64(leftover[pos])
+    pos_digits = pos - leftover.shape[0]
+    if pos_digits < ndigits:
+        return int64(digits[pos_digits])
+    pos_suffix = pos_digits - ndigits
+    if pos_suffix < suffix.shape[0]:
+        return int64(suffix[pos_suffix])
+    if pos == tail_len:
+        return int64(0x80)
+    if pos >= total - 8:
+        return (bit_len >> (8 * (total - 1 - pos))) & 0xFF
+    return int64(0)
+
+@cuda.jit(device=True)
+def _compress_tail(state, w, offset, leftover, digits, ndigits, suffix, tail_len, total, bit_len):
+    for i in range(16):
+        j = offset + 4 * i
+        w[i] = ((_tail_byte(j, leftover, digits, ndigits, suffix, tail_len, total, bit_len) << 24)
+                | (_tail_byte(j + 1, leftover, digits, ndigits, suffix, tail_len, total, bit_len) << 16)
+                | (_tail_byte(j + 2, leftover, digits, ndigits, suffix, tail_len, total, bit_len) << 8)
+                | _tail_byte(j + 3, leftover, digits, ndigits, suffix, tail_len, total, bit_len))
+    for i in range(16, 64):
+        x = w[i - 15]
+        y = w[i - 2]
+        s0 = _rotr(x, 7) ^ _rotr(x, 18) ^ (x >> 3)
+        s1 = _rotr(y, 17) ^ _rotr(y, 19) ^ (y >> 10)
+        w[i] = (w[i - 16] + s0 + w[i - 7] + s1) & _MASK
+
+    a = state[0]
+    b = state[1]
+    c = state[2]
+    d = state[3]
+    e = state[4]
+    f = state[5]
+    g = state[6]
+    h = state[7]
+    for i in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ ((e ^ _MASK) & g)
+        t1 = (h + s1 + ch + _K[i] + w[i]) & _MASK
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        t2 = (s0 + maj) & _MASK
+        h = g
+        g = f
+        f = e
+        e = (d + t1) & _MASK
+        d = c
+        c = b
+        b = a
+        a = (t1 + t2) & _MASK
+
+    state[0] = (state[0] + a) & _MASK
+    state[1] = (state[1] + b) & _MASK
+    state[2] = (state[2] + c) & _MASK
+    state[3] = (state[3] + d) & _MASK
+    state[4] = (state[4] + e) & _MASK
+    state[5] = (state[5] + f) & _MASK
+    state[6] = (state[6] + g) & _MASK
+    state[7] = (state[7] + h) & _MASK
+
+@cuda.jit
+def _search_kernel(midstate, leftover, suffix, message_len, start, count, zero_bits, hashes_per_thread, result):
+    first = cuda.grid(1) * hashes_per_thread
+    if first >= count:
+        return
+
+    w = cuda.local.array(64, int64)
+    state = cuda.local.array(8, int64)
+    digits = cuda.local.array(20, uint8)
+
+    for k in range(hashes_per_thread):
+        if first + k >= count:
+            return
+        nonce = start + first + k
+        if nonce >= result[0]:
+            return  # a lower winning nonce is already known
+
+        ndigits = 1
+        value = nonce
+        while value >= 10:
+            value //= 10
+            ndigits += 1
+        value = nonce
+        for i in range(ndigits - 1, -1, -1):
+            digits[i] = 48 + value % 10
+            value //= 10
+
+        tail_len = leftover.shape[0] + ndigits + suffix.shape[0]
+        total = ((tail_len + 8) // 64 + 1) * 64
+        bit_len = (message_len + ndigits) * 8
+        for i in range(8):
+            state[i] = midstate[i]
+        for offset in range(0, total, 64):
+            _compress_tail(state, w, offset, leftover, digits, ndigits, suffix, tail_len, total, bit_len)
+
+        words = zero_bits // 32
+        hit = True
+        for i in range(words):
+            if state[i] != 0:
+                hit = False
+        rest = zero_bits % 32
+        if hit and rest and (state[words] >> (32 - rest)) != 0:
+            hit = False
+        if hit:
+            cuda.atomic.min(result, 0, nonce)
+            return
+
+def solve(prefix: bytes, suffix: bytes, difficulty: int, nonce_start: int, batch: int = BATCH_SIZE) -> Optional[int]:
+    """Return the lowest winning nonce in [nonce_start, nonce_start + batch), or None"""
+    midstate, leftover = _midstate(np.frombuffer(prefix, dtype=np.uint8))
+    result = cuda.to_device(np.array([_NOT_FOUND], dtype=np.int64))
+    threads = (batch + HASHES_PER_THREAD - 1) // HASHES_PER_THREAD
+    blocks = (threads + THREADS_PER_BLOCK - 1) // THREADS_PER_BLOCK
+
+    _search_kernel[blocks, THREADS_PER_BLOCK](
+        cuda.to_device(midstate),
+        cuda.to_device(leftover),
+        cuda.to_device(np.frombuffer(suffix, dtype=np.uint8)),
+        len(prefix) + len(suffix), nonce_start, batch, difficulty * 4,
+        HASHES_PER_THREAD, result
+    )
+
+    nonce = int(result.copy_to_host()[0])
+    return None if nonce == _NOT_FOUND else nonce
+
+def mine_range(prefix: bytes, suffix: bytes, start: int, count: int, difficulty: int) -> int:
+    """Search a nonce range on the GPU; same contract as mining.mine_range"""
+    nonce = solve(prefix, suffix, difficulty, start, count)
+    return -1 if nonce is None else nonce
@@ -0,0 +1,151 @@
+"""
+Proof-of-work nonce search backends
+
+Every backend exposes the same search function:
+
+    search(prefix, suffix, start, count, difficulty) -> nonce or -1
+
+It returns the lowest nonce in [start, start + count) whose SHA-256 of
+prefix + str(nonce) + suffix starts with `difficulty` hex zeros.
+
+'auto' prefers, in order: the native SHA-NI / ARMv8 extension, a CUDA GPU,
+the Numba kernel on many-core machines, and hashlib.
+"""
+
+import atexit
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Tuple
+
+PYTHON_BATCH_SIZE = 10000
+NATIVE_BATCH_SIZE = 1 << 18
+NUMBA_SHARD_SIZE = 1 << 14
+NUMBA_MIN_THREADS = 8
+
+BACKENDS = ('auto', 'cuda', 'cpu')
+
+_backends = {}
+_pools = {}
+
+def mine_range(prefix: bytes, suffix: bytes, start: int, count: int, difficulty: int) -> int:
+    """Search a nonce range with hashlib, reusing the hashed prefix for every nonce"""
+    target = "0" * difficulty
+    base = hashlib.sha256(prefix)
+    
+    for nonce in range(start, start + count):
+        block_hash = base.copy()
+        block_hash.update(str(nonce).encode() + suffix)
+        if block_hash.hexdigest().startswith(target):
+            return nonce
+    
+    return -1
+
+def _native_backend():
+    try:
+        # Built from _sha256ni.c by setup.py when a compiler is available
+        from . import _sha256ni
+    except ImportError:
+        return None
+    # Portable C is no faster than hashlib's OpenSSL, so only hardware SHA counts
+    if not _sha256ni.hardware_accelerated():
+        return None
+    return _sha256ni.mine_range, NATIVE_BATCH_SIZE
+
+def _cpu_backend():
+    native = _native_backend()
+    if native:
+        return native
+    
+    try:
+        # Numba is optional; import lazily so it only loads when mining
+        from . import numba_miner
+    except ImportError:
+        numba_miner = None
+    
+    # hashlib runs on OpenSSL (SHA-NI where available) and is several times faster
+    # per core than the JIT kernel, which only wins once it can spread over many cores
+    if numba_miner and numba_miner.get_num_threads() >= NUMBA_MIN_THREADS:
+        return numba_miner.mine_range, numba_miner.get_num_threads() * NUMBA_SHARD_SIZE
+    return mine_range, PYTHON_BATCH_SIZE
+
+def _cuda_backend():
+    try:
+        from . import cuda_miner
+    except ImportError:
+        return None
+    if not cuda_miner.is_available():
+        return None
+    return cuda_miner.mine_range, cuda_miner.BATCH_SIZE
+
+def _mine_worker(use_native: bool, prefix: bytes, suffix: bytes, start: int, count: int, difficulty: int) -> int:
+    """Search one shard in a worker process with the native or hashlib backend"""
+    if use_native:
+        from . import _sha256ni
+        return _sha256ni.mine_range(prefix, suffix, start, count, difficulty)
+    return mine_range(prefix, suffix, start, count, difficulty)
+
+def _sharded_backend(use_native: bool, batch_size: int, workers: int):
+    """Spread a single-core backend over a process pool, one shard per worker"""
+    if workers not in _pools:
+        # Spawned workers start clean: forking after Numba or CUDA started threads can deadlock
+        _pools[workers] = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('spawn')
+        )
+    pool = _pools[workers]
+    
+    def search(prefix, suffix, start, count, difficulty):
+        shard = (count + workers - 1) // workers
+        futures = [
+            pool.submit(_mine_worker, use_native, prefix, suffix, lo, min(shard, start + count - lo), difficulty)
+            for lo in range(start, start + count, shard)
+        ]
+        # Wait for every shard: a later shard can hit before an earlier one does
+        hits = [nonce for nonce in (future.result() for future in futures) if nonce >= 0]
+        return min(hits) if hits else -1
+    
+    return search, batch_size * workers
+
+@atexit.register
+def _shutdown_pools():
+    """Stop the mining worker processes when the interpreter exits"""
+    for pool in _pools.values():
+        pool.shutdown(wait=True)
+    _pools.clear()
+
+def get_search_backend(preference: str = 'auto', workers: int = 1) -> Tuple[Callable[[bytes, bytes, int, int, int], int], int]:
+    """Return the search function and batch size for a backend preference
+    
+    'auto' uses hardware SHA-256 instructions, then a CUDA GPU, then the
+    remaining CPU backends; 'cuda' falls back to the CPU with a warning when
+    no GPU is usable. With workers > 1 the single-core backends (native and
+    hashlib) are sharded over that many spawned processes instead of using
+    Numba.
+    """
+    if workers > 1:
+        key = (preference, workers)
+        if key not in _backends:
+            # Numba is never probed here: the processes replace its thread pool
+            native = _native_backend()
+            gpu = None
+            if preference == 'cuda' or (preference == 'auto' and native is None):
+                gpu = _cuda_backend()
+                if gpu is None and preference == 'cuda':
+                    print("CUDA miner unavailable, falling back to CPU mining")
+            if gpu:
+                # The GPU already uses the whole device
+                _backends[key] = gpu
+            elif native:
+                _backends[key] = _sharded_backend(True, native[1], workers)
+            else:
+                _backends[key] = _sharded_backend(False, PYTHON_BATCH_SIZE, workers)
+        return _backends[key]
+    
+    if preference not in _backends:
+        backend = _native_backend() if preference == 'auto' else None
+        if backend is None and preference in ('auto', 'cuda'):
+            backend = _cuda_backend()
+            if backend is None and preference == 'cuda':
+                print("CUDA miner unavailable, falling back to CPU mining")
+        _backends[preference] = backend or _cpu_backend()
+    return _backends[preference]
@@ -0,0 +1,168 @@
+"""
+Numba-compiled proof-of-work nonce search
+
+SHA-256 is implemented directly in nopython mode so the nonce loop runs
+without the GIL and is sharded across cores with prange. The prefix blocks
+are compressed once per batch (midstate); each nonce only hashes the tail.
+
+Importing this module raises ImportError when Numba is not installed.
+"""
+
+import numpy as np
+from numba import njit, prange, get_num_threads
+
+_MASK = 0xFFFFFFFF
+
+_K = np.array([
+    0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
+    0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
+    0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
+    0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
+    0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
+    0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
+    0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
+    0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2,
+], dtype=np.int64)
+
+_H0 = np.array([
+    0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a, 0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19,
+], dtype=np.int64)
+
+@njit(cache=True, inline='always')
+def _rotr(x, n):
+    return ((x >> n) | (x << (32 - n))) & _MASK
+
+@njit(cache=True, nogil=True)
+def _compress(state, buf, offset, w):
+    """Run one SHA-256 compression over buf[offset:offset + 64] into state"""
+    for i in range(16):
+        j = offset + 4 * i
+        w[i] = ((np.int64(buf[j]) << 24) | (np.int64(buf[j + 1]) << 16)
+                | (np.int64(buf[j + 2]) << 8) | np.int64(buf[j + 3]))
+    for i in range(16, 64):
+        x = w[i - 15]
+        y = w[i - 2]
+        s0 = _rotr(x, 7) ^ _rotr(x, 18) ^ (x >> 3)
+        s1 = _rotr(y, 17) ^ _rotr(y, 19) ^ (y >> 10)
+        w[i] = (w[i - 16] + s0 + w[i - 7] + s1) & _MASK
+    
+    a = state[0]
+    b = state[1]
+    c = state[2]
+    d = state[3]
+    e = state[4]
+    f = state[5]
+    g = state[6]
+    h = state[7]
+    for i in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ ((e ^ _MASK) & g)
+        t1 = (h + s1 + ch + _K[i] + w[i]) & _MASK
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        t2 = (s0 + maj) & _MASK
+        h = g
+        g = f
+        f = e
+        e = (d + t1) & _MASK
+        d = c
+        c = b
+        b = a
+        a = (t1 + t2) & _MASK
+    
+    state[0] = (state[0] + a) & _MASK
+    state[1] = (state[1] + b) & _MASK
+    state[2] = (state[2] + c) & _MASK
+    state[3] = (state[3] + d) & _MASK
+    state[4] = (state[4] + e) & _MASK
+    state[5] = (state[5] + f) & _MASK
+    state[6] = (state[6] + g) & _MASK
+    state[7] = (state[7] + h) & _MASK
+
+@njit(cache=True, nogil=True)
+def _midstate(prefix):
+    """Compress the whole 64-byte blocks of prefix, returning (state, leftover bytes)"""
+    state = _H0.copy()
+    w = np.zeros(64, dtype=np.int64)
+    full = (len(prefix) // 64) * 64
+    for offset in range(0, full, 64):
+        _compress(state, prefix, offset, w)
+    return state, prefix[full:].copy()
+
+@njit(cache=True, inline='always')
+def _has_leading_zero_bits(state, zero_bits):
+    words = zero_bits // 32
+    for i in range(words):
+        if state[i] != 0:
+            return False
+    rest = zero_bits % 32
+    if rest == 0:
+        return True
+    return (state[words] >> (32 - rest)) == 0
+
+@njit(cache=True, nogil=True)
+def _write_tail(buf, leftover, nonce, suffix, message_len):
+    """Lay out leftover + decimal nonce + suffix + SHA-256 padding; return tail length"""
+    n = len(leftover)
+    buf[:n] = leftover
+    
+    digits = 1
+    value = nonce
+    while value >= 10:
+        value //= 10
+        digits += 1
+    value = nonce
+    for i in range(digits - 1, -1, -1):
+        buf[n + i] = 48 + value % 10
+        value //= 10
+    n += digits
+    
+    buf[n:n + len(suffix)] = suffix
+    n += len(suffix)
+    
+    total = ((n + 8) // 64 + 1) * 64
+    buf[n] = 0x80
+    buf[n + 1:total - 8] = 0
+    bit_len = (message_len + digits) * 8
+    for i in range(8):
+        buf[total - 1 - i] = (bit_len >> (8 * i)) & 0xFF
+    return total
+
+@njit(parallel=True, nogil=True, cache=True)
+def _search(prefix, suffix, start, count, zero_bits, shards):
+    midstate, leftover = _midstate(prefix)
+    message_len = len(prefix) + len(suffix)
+    shard_size = (count + shards - 1) // shards
+    buf_size = ((len(leftover) + 20 + len(suffix) + 8) // 64 + 1) * 64
+    found = np.full(shards, -1, dtype=np.int64)
+    
+    for shard in prange(shards):
+        lo = start + shard * shard_size
+        hi = min(lo + shard_size, start + count)
+        buf = np.zeros(buf_size, dtype=np.uint8)
+        w = np.zeros(64, dtype=np.int64)
+        state = np.empty(8, dtype=np.int64)
+        for nonce in range(lo, hi):
+            total = _write_tail(buf, leftover, nonce, suffix, message_len)
+            state[:] = midstate
+            for offset in range(0, total, 64):
+                _compress(state, buf, offset, w)
+            if _has_leading_zero_bits(state, zero_bits):
+                found[shard] = nonce
+                break
+    
+    # Each shard stops at its first hit, so the lowest hit across shards is the answer
+    best = -1
+    for shard in range(shards):
+        if found[shard] >= 0 and (best < 0 or found[shard] < best):
+            best = found[shard]
+    return best
+
+def mine_range(prefix: bytes, suffix: bytes, start: int, count: int, difficulty: int) -> int:
+    """Search a nonce range on all cores; same contract as mining.mine_range"""
+    shards = get_num_threads()
+    return int(_search(
+        np.frombuffer(prefix, dtype=np.uint8),
+        np.frombuffer(suffix, dtype=np.uint8),
+        start, count, difficulty * 4, shards
+    ))
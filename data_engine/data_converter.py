@@ -1,4 +1,6 @@
 import requests
+from requests.adapters import HTTPAdapter
+import asyncio
 import hashlib
 import time
 import json
@@ -36,14 +38,61 @@ class DataSource:
             'currency_generated': self.currency_generated
         }
 
+class CircuitBreaker:
+    """Stops calling a failing source for a while after repeated failures"""
+    
+    def __init__(self, fail_max: int = 3, reset_timeout: float = 30):
+        self.fail_max = fail_max
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Closed breakers let every call through; open ones one trial call per reset timeout"""
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            now = time.monotonic()
+            if now - self.opened_at < self.reset_timeout:
+                return False
+            # Half-open: restart the wait so concurrent callers are refused while
+            # this trial runs (and again if it never reports back)
+            self.opened_at = now
+            return True
+    
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+    
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.failures >= self.fail_max:
+                # (Re)open; a failed trial call restarts the wait
+                self.opened_at = time.monotonic()
+
 class DataCollector:
     """Collects data from various internet sources"""
     
+    # Keep-alive pool sizing: one pool per source host, with room for concurrent
+    # collections against the same host
+    POOL_CONNECTIONS = 16
+    POOL_MAXSIZE = 32
+    
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'DataCoin-Collector/1.0'
         })
+        adapter = HTTPAdapter(pool_connections=self.POOL_CONNECTIONS, pool_maxsize=self.POOL_MAXSIZE)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+    
+    def close(self):
+        """Close pooled HTTP connections"""
+        self.session.close()
     
     def collect_web_data(self, url: str) -> Tuple[float, Dict]:
         """Collect data from a web page"""
@@ -187,7 +236,12 @@ class DataConverter:
         self.blockchain = blockchain
         self.collector = DataCollector()
         self.calculator = DataValueCalculator()
+        # Collector per source type; anything not listed is fetched as a web page
+        self._collectors = {
+            'api': self.collector.collect_api_data,
+        }
         self.sources: Dict[str, DataSource] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
         self.is_running = False
         self.conversion_thread = None
         
@@ -282,14 +336,20 @@ class DataConverter:
         
         source = self.sources[source_id]
         
+        # Skip sources that keep failing instead of waiting out their timeouts every time
+        breaker = self._breakers.setdefault(source_id, CircuitBreaker())
+        if not breaker.allow():
+            print(f"⏳ Skipping {source_id} after repeated failures; will retry later")
+            return None
+        
         # Collect data
-        if source.source_type == 'api':
-            data_size, metrics = self.collector.collect_api_data(source.url)
-        else:
-            data_size, metrics = self.collector.collect_web_data(source.url)
+        collect = self._collectors.get(source.source_type, self.collector.collect_web_data)
+        data_size, metrics = collect(source.url)
         
         if data_size == 0:
+            breaker.record_failure()
             return None
+        breaker.record_success()
         
         # Calculate currency value
         currency_value = self.calculator.calculate_currency_value(data_size, source, metrics)
@@ -312,6 +372,11 @@ class DataConverter:
         print(f"Converted {data_size:.6f} MB from {source_id} to {currency_value:.6f} DataCoins")
         return transaction
     
+    async def async_collect_and_convert(self, source_id: str, recipient_address: str) -> Optional[Transaction]:
+        """Collect and convert on a worker thread so several sources can be fetched concurrently"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self.collect_and_convert, source_id, recipient_address)
+    
     def _save_conversion_history(self, source_id: str, data_size: float, currency_value: float, quality: str, metrics: Dict):
         """Save conversion to history"""
         conn = sqlite3.connect(self.db_path)
@@ -407,6 +472,12 @@ class DataConverter:
     def get_source_list(self) -> List[Dict]:
         """Get list of all data sources"""
         return [source.to_dict() for source in self.sources.values()]
+    
+    def close(self):
+        """Stop background conversion and release pooled HTTP connections"""
+        if self.is_running:
+            self.stop_auto_conversion()
+        self.collector.close()
 
 # Default data sources for demonstration
 DEFAULT_DATA_SOURCES = [
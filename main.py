@@ -18,6 +18,10 @@ Options:
     --api-only      Start only the API server
     --interactive   Start interactive command-line interface
     --web           Open web interface after starting API
+    --miner         Mining backend: auto, cuda or cpu
+    --mining-workers  Processes to shard CPU mining over
+    --workers       API server processes (with --api-only)
+    --access-log    Log every API request
 """
 
 import asyncio
@@ -27,39 +31,134 @@ import threading
 import webbrowser
 import sys
 import os
-from datetime import datetime
+import importlib.util
+from itertools import islice
+from pathlib import Path
+from typing import Optional
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from blockchain.core import Blockchain
+from blockchain.mining import BACKENDS as MINING_BACKENDS
 from wallet.wallet import WalletManager
 from data_engine.data_converter import DataConverter, DEFAULT_DATA_SOURCES
-from api.main import app
-import uvicorn
+
+# Bundled web interface, resolved once at import
+_FRONTEND_PATH = (Path(__file__).parent / 'frontend' / 'index.html').resolve()
+_FRONTEND_URL = _FRONTEND_PATH.as_uri() if _FRONTEND_PATH.exists() else None
+
+def _select_server_backends():
+    """Pick the fastest uvicorn event loop and HTTP parser available on this platform"""
+    # uvloop is POSIX-only; both fall back to the pure-Python implementations
+    if sys.platform != 'win32' and importlib.util.find_spec('uvloop'):
+        loop = 'uvloop'
+    else:
+        loop = 'asyncio'
+    http = 'httptools' if importlib.util.find_spec('httptools') else 'h11'
+    return loop, http
+
+class TTLCache:
+    """Tiny in-process cache mapping key -> (expiry, value), with hit/miss counters"""
+    
+    def __init__(self):
+        self._entries = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get_or_set(self, key, ttl, compute):
+        """Return the cached value for key, computing and storing it when missing or expired"""
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry and entry[0] > now:
+            self.hits += 1
+            return entry[1]
+        
+        self.misses += 1
+        value = compute()
+        self._entries[key] = (now + ttl, value)
+        return value
+    
+    def evict(self, *keys):
+        """Drop keys whose underlying data has changed"""
+        for key in keys:
+            self._entries.pop(key, None)
+    
+    def get_stats(self):
+        """Cache effectiveness counters"""
+        return {'hits': self.hits, 'misses': self.misses, 'size': len(self._entries)}
+
+# Dashboard cache keys and lifetimes (seconds)
+CONVERSION_STATS_KEY = 'dashboard:conversion:v1'
+CONVERSION_STATS_TTL = 5
 
 class DataCoinSystem:
     """Main DataCoin system controller"""
     
-    def __init__(self):
+    def __init__(self, miner='auto', mining_workers=1):
         print("🪙 Initializing DataCoin System...")
         
         # Initialize core components
         self.blockchain = Blockchain()
+        self.blockchain.mining_backend = miner
+        self.blockchain.mining_workers = mining_workers
         self.wallet_manager = WalletManager()
         self.data_converter = DataConverter(self.blockchain)
+        self.cache = TTLCache()
         
         # Setup default data sources
         for source_config in DEFAULT_DATA_SOURCES:
             self.data_converter.add_data_source(**source_config)
         
+        # CLI command table: command -> (handler, argument kind, description)
+        # Kind None takes no arguments, 'wallet' requires a loaded wallet and
+        # 'name' takes a wallet name and makes the returned wallet current.
+        self._commands = {
+            'help': (self.show_help, None, 'Show this help message'),
+            'status': (self.show_system_status, None, 'Show system status'),
+            'create wallet': (self.create_wallet_cli, 'name', 'Create a new wallet (--rsa for RSA keys)'),
+            'list wallets': (self.list_wallets_cli, None, 'List all wallets'),
+            'load wallet': (self.load_wallet_cli, 'name', 'Load a wallet'),
+            'balance': (self.show_balance_cli, 'wallet', 'Show current wallet balance'),
+            'mine': (self.mine_block_cli, 'wallet', 'Mine a block with current wallet'),
+            'send': (self.send_transaction_cli, 'wallet', 'Send DataCoins to another address'),
+            'convert data': (self.convert_data_cli, 'wallet', 'Convert data to DataCoins'),
+            'collect data': (self.collect_data_cli, 'wallet', 'Collect data from sources'),
+            'buy shares': (self.buy_shares_cli, 'wallet', 'Buy corporate shares'),
+            'blockchain': (self.show_blockchain_cli, None, 'Show blockchain information'),
+            'fsck': (self.fsck_cli, None, 'Re-validate every block in the chain'),
+        }
+        
+        # The command table is static, so the help text is built once
+        help_lines = ["", "📚 Available Commands:"]
+        for name, (_, kind, description) in self._commands.items():
+            usage = f"{name} <name>" if kind == 'name' else name
+            help_lines.append(f"    {usage:<21}- {description}")
+        help_lines.append(f"    {'exit':<21}- Exit the CLI")
+        self._help_text = "\n".join(help_lines)
+        
+        # Fill the dashboard cache off the main thread so the first status view is a hit
+        if not os.environ.get("DATACOIN_NO_WARM"):
+            threading.Thread(target=self._warm_caches, daemon=True).start()
+        
         print("✅ DataCoin system initialized successfully!")
     
+    def _warm_caches(self):
+        """Pre-compute cached dashboard data in the background"""
+        try:
+            self._get_conversion_stats()
+        except Exception as e:
+            print(f"⚠️ Cache warm-up failed: {e}")
+    
     def create_demo_scenario(self):
         """Create a demonstration scenario with sample data"""
+        return asyncio.run(self.create_demo_scenario_async())
+    
+    async def create_demo_scenario_async(self):
+        """Create the demonstration scenario, overlapping its independent blocking steps"""
         print("\n🎭 Creating demonstration scenario...")
         
-        # Create demo wallets
+        # Create demo wallets inline: Ed25519 keygen takes microseconds
         alice_wallet = self.wallet_manager.create_wallet("alice")
         bob_wallet = self.wallet_manager.create_wallet("bob")
         miner_wallet = self.wallet_manager.create_wallet("miner")
@@ -69,18 +168,20 @@ class DataCoinSystem:
         bob_wallet.connect_to_blockchain(self.blockchain)
         miner_wallet.connect_to_blockchain(self.blockchain)
         
-        print(f"👤 Alice wallet: {alice_wallet.address}")
-        print(f"👤 Bob wallet: {bob_wallet.address}")
-        print(f"⛏️ Miner wallet: {miner_wallet.address}")
+        self._write_lines([
+            f"👤 Alice wallet: {alice_wallet.address}",
+            f"👤 Bob wallet: {bob_wallet.address}",
+            f"⛏️ Miner wallet: {miner_wallet.address}"
+        ])
         
         # Simulate data conversion for Alice
         print("\n🌐 Simulating data conversion...")
         alice_wallet.convert_data_to_currency(5.0)  # 5 MB of data
         bob_wallet.convert_data_to_currency(3.5)    # 3.5 MB of data
         
-        # Mine the first block
+        # Mining stays serial: each block chains on the previous block's hash
         print("\n⛏️ Mining first block...")
-        miner_wallet.mine_block()
+        self._mine_if_pending(miner_wallet)
         
         # Create some transactions
         print("\n💸 Creating transactions...")
@@ -89,16 +190,15 @@ class DataCoinSystem:
         
         # Collect data from sources
         print("\n📊 Collecting data from sources...")
-        for source_id in list(self.data_converter.sources.keys())[:2]:
-            try:
-                self.data_converter.collect_and_convert(source_id, alice_wallet.address)
-                time.sleep(1)  # Brief delay between collections
-            except Exception as e:
-                print(f"⚠️ Could not collect from {source_id}: {e}")
+        source_ids = list(islice(self.data_converter.sources, 2))
+        results = await self._collect_from_sources(source_ids, alice_wallet.address)
+        for source_id, result in zip(source_ids, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ Could not collect from {source_id}: {result}")
         
         # Mine another block
         print("\n⛏️ Mining second block...")
-        miner_wallet.mine_block()
+        self._mine_if_pending(miner_wallet)
         
         # Corporate shares demonstration
         print("\n🏢 Demonstrating corporate shares...")
@@ -106,25 +206,39 @@ class DataCoinSystem:
         
         # Final mining and balance check
         print("\n⛏️ Final mining...")
-        miner_wallet.mine_block()
+        self._mine_if_pending(miner_wallet)
         
-        # Display final balances
-        print("\n💰 Final Balances:")
-        print(f"Alice: {alice_wallet.get_balance():.6f} DataCoins")
-        print(f"Bob: {bob_wallet.get_balance():.6f} DataCoins")
-        print(f"Miner: {miner_wallet.get_balance():.6f} DataCoins")
-        
-        # Display blockchain stats
+        # Display final balances and blockchain stats
         stats = self.blockchain.get_blockchain_stats()
-        print(f"\n📊 Blockchain Statistics:")
-        print(f"Total Blocks: {stats['total_blocks']}")
-        print(f"Total Transactions: {stats['total_transactions']}")
-        print(f"Mining Difficulty: {stats['current_difficulty']}")
-        print(f"Data Converted: {stats['total_data_converted_mb']:.3f} MB")
-        print(f"Corporate Shares: {stats['corporate_shares']}")
+        self._write_lines([
+            "\n💰 Final Balances:",
+            f"Alice: {alice_wallet.get_balance():.6f} DataCoins",
+            f"Bob: {bob_wallet.get_balance():.6f} DataCoins",
+            f"Miner: {miner_wallet.get_balance():.6f} DataCoins",
+            "\n📊 Blockchain Statistics:",
+            f"Total Blocks: {stats['total_blocks']}",
+            f"Total Transactions: {stats['total_transactions']}",
+            f"Mining Difficulty: {stats['current_difficulty']}",
+            f"Data Converted: {stats['total_data_converted_mb']:.3f} MB",
+            f"Corporate Shares: {stats['corporate_shares']}"
+        ])
         
         return alice_wallet, bob_wallet, miner_wallet
     
+    def _write_lines(self, lines):
+        """Write a block of output lines with a single stdout write"""
+        sys.stdout.write("\n".join(lines) + "\n")
+    
+    async def _collect_from_sources(self, source_ids, recipient_address):
+        """Collect from several data sources concurrently"""
+        results = await asyncio.gather(
+            *(self.data_converter.async_collect_and_convert(source_id, recipient_address)
+              for source_id in source_ids),
+            return_exceptions=True
+        )
+        self.cache.evict(CONVERSION_STATS_KEY)
+        return results
+    
     def interactive_cli(self):
         """Interactive command-line interface"""
         print("\n🖥️ DataCoin Interactive CLI")
@@ -138,83 +252,59 @@ class DataCoinSystem:
                 
                 if command == 'exit' or command == 'quit':
                     break
-                elif command == 'help':
-                    self.show_help()
-                elif command == 'status':
-                    self.show_system_status()
-                elif command.startswith('create wallet'):
-                    wallet_name = command.split(' ', 2)[2] if len(command.split(' ', 2)) > 2 else input("Wallet name: ")
-                    current_wallet = self.create_wallet_cli(wallet_name)
-                elif command == 'list wallets':
-                    self.list_wallets_cli()
-                elif command.startswith('load wallet'):
-                    wallet_name = command.split(' ', 2)[2] if len(command.split(' ', 2)) > 2 else input("Wallet name: ")
-                    current_wallet = self.load_wallet_cli(wallet_name)
-                elif command == 'balance':
-                    if current_wallet:
-                        print(f"Balance: {current_wallet.get_balance():.6f} DataCoins")
-                    else:
-                        print("❌ No wallet loaded")
-                elif command == 'mine':
-                    if current_wallet:
-                        self.mine_block_cli(current_wallet)
-                    else:
-                        print("❌ No wallet loaded")
-                elif command.startswith('send'):
-                    if current_wallet:
-                        self.send_transaction_cli(current_wallet)
-                    else:
-                        print("❌ No wallet loaded")
-                elif command == 'convert data':
-                    if current_wallet:
-                        self.convert_data_cli(current_wallet)
-                    else:
-                        print("❌ No wallet loaded")
-                elif command == 'collect data':
-                    if current_wallet:
-                        self.collect_data_cli(current_wallet)
-                    else:
-                        print("❌ No wallet loaded")
-                elif command == 'buy shares':
+                
+                name, arg = self._parse_command(command)
+                entry = self._commands.get(name)
+                if not entry:
+                    print("❌ Unknown command. Type 'help' for available commands.")
+                    continue
+                
+                handler, kind, _ = entry
+                if kind == 'name':
+                    current_wallet = handler(arg or input("Wallet name: "))
+                elif kind == 'wallet':
                     if current_wallet:
-                        self.buy_shares_cli(current_wallet)
+                        handler(current_wallet)
                     else:
                         print("❌ No wallet loaded")
-                elif command == 'blockchain':
-                    self.show_blockchain_cli()
                 else:
-                    print("❌ Unknown command. Type 'help' for available commands.")
+                    handler()
                     
             except KeyboardInterrupt:
                 break
             except Exception as e:
                 print(f"❌ Error: {e}")
         
+        self.close()
         print("\n👋 Goodbye!")
     
+    def close(self):
+        """Release HTTP connections and close the open wallet databases"""
+        self.data_converter.close()
+        self.wallet_manager.close()
+    
+    def _parse_command(self, command):
+        """Split a CLI command into its table key and optional wallet name argument"""
+        # 'send' has always matched by prefix, so "send 5" or "send to bob" still sends
+        if command.startswith('send'):
+            return 'send', ''
+        parts = command.split(' ', 2)
+        name = ' '.join(parts[:2])
+        if len(parts) > 2 and name in self._commands and self._commands[name][1] == 'name':
+            return name, parts[2]
+        return command, ''
+    
     def show_help(self):
         """Show available CLI commands"""
-        print("""
-📚 Available Commands:
-    help                  - Show this help message
-    status               - Show system status
-    create wallet <name> - Create a new wallet
-    list wallets         - List all wallets
-    load wallet <name>   - Load a wallet
-    balance              - Show current wallet balance
-    mine                 - Mine a block with current wallet
-    send                 - Send DataCoins to another address
-    convert data         - Convert data to DataCoins
-    collect data         - Collect data from sources
-    buy shares           - Buy corporate shares
-    blockchain           - Show blockchain information
-    exit                 - Exit the CLI
-        """)
+        print(self._help_text)
     
     def show_system_status(self):
         """Show system status"""
         stats = self.blockchain.get_blockchain_stats()
-        data_stats = self.data_converter.get_conversion_stats()
+        data_stats = self._get_conversion_stats()
+        share_lines = "\n".join(
+            f"     • {company}: {shares}" for company, shares in stats['corporate_shares'].items()
+        )
         
         print(f"""
 📊 System Status:
@@ -231,14 +321,24 @@ class DataCoinSystem:
      • Conversion Rate: {data_stats['conversion_rate']:.6f} DC/MB
      
    Corporate Shares:
-     • Google: {stats['corporate_shares']['Google']}
-     • Microsoft: {stats['corporate_shares']['Microsoft']}
-     • NBC Universal: {stats['corporate_shares']['NBC Universal']}
+{share_lines}
         """)
     
+    def _get_conversion_stats(self):
+        """Conversion statistics, cached briefly since they aggregate the conversion history"""
+        return self.cache.get_or_set(
+            CONVERSION_STATS_KEY, CONVERSION_STATS_TTL, self.data_converter.get_conversion_stats
+        )
+    
     def create_wallet_cli(self, wallet_name):
         """Create wallet via CLI"""
-        wallet = self.wallet_manager.create_wallet(wallet_name)
+        # 'create wallet <name> --rsa' keeps the legacy RSA key type
+        key_type = 'ed25519'
+        if wallet_name.endswith(' --rsa'):
+            wallet_name = wallet_name[:-len(' --rsa')].strip()
+            key_type = 'rsa'
+        
+        wallet = self.wallet_manager.create_wallet(wallet_name, key_type)
         wallet.connect_to_blockchain(self.blockchain)
         print(f"✅ Wallet '{wallet_name}' created with address: {wallet.address}")
         return wallet
@@ -247,9 +347,7 @@ class DataCoinSystem:
         """List wallets via CLI"""
         wallets = self.wallet_manager.list_wallets()
         if wallets:
-            print("💼 Available Wallets:")
-            for wallet in wallets:
-                print(f"   • {wallet}")
+            self._write_lines(["💼 Available Wallets:"] + [f"   • {wallet}" for wallet in wallets])
         else:
             print("❌ No wallets found")
     
@@ -264,15 +362,28 @@ class DataCoinSystem:
             print(f"❌ Wallet '{wallet_name}' not found")
             return None
     
+    def _mine_if_pending(self, wallet, banner: Optional[str] = None) -> Optional[bool]:
+        """Mine a block with the given wallet, skipping proof-of-work when nothing is pending
+        
+        Returns None if there were no pending transactions, otherwise the mining result.
+        The banner, if given, is printed only when mining actually starts.
+        """
+        if len(self.blockchain.pending_transactions) == 0:
+            return None
+        if banner:
+            print(banner)
+        return wallet.mine_block()
+    
+    def show_balance_cli(self, wallet):
+        """Show wallet balance via CLI"""
+        print(f"Balance: {wallet.get_balance():.6f} DataCoins")
+    
     def mine_block_cli(self, wallet):
         """Mine block via CLI"""
-        if len(self.blockchain.pending_transactions) == 0:
+        success = self._mine_if_pending(wallet, "⛏️ Mining block... (this may take a moment)")
+        if success is None:
             print("❌ No pending transactions to mine")
-            return
-        
-        print("⛏️ Mining block... (this may take a moment)")
-        success = wallet.mine_block()
-        if success:
+        elif success:
             print(f"✅ Block mined successfully! Reward: {self.blockchain.mining_reward} DC")
         else:
             print("❌ Mining failed")
@@ -309,15 +420,16 @@ class DataCoinSystem:
             print("❌ No data sources available")
             return
         
-        print("📊 Available data sources:")
-        for i, source_id in enumerate(sources):
-            print(f"   {i+1}. {source_id}")
+        self._write_lines(["📊 Available data sources:"] + [
+            f"   {i+1}. {source_id}" for i, source_id in enumerate(sources)
+        ])
         
         try:
             choice = int(input("Select source (number): ")) - 1
             if 0 <= choice < len(sources):
                 source_id = sources[choice]
                 transaction = self.data_converter.collect_and_convert(source_id, wallet.address)
+                self.cache.evict(CONVERSION_STATS_KEY)
                 if transaction:
                     print(f"✅ Collected data from {source_id}")
                 else:
@@ -330,9 +442,9 @@ class DataCoinSystem:
     def buy_shares_cli(self, wallet):
         """Buy corporate shares via CLI"""
         companies = ['Google', 'Microsoft', 'NBC Universal']
-        print("🏢 Available companies:")
-        for i, company in enumerate(companies):
-            print(f"   {i+1}. {company}")
+        self._write_lines(["🏢 Available companies:"] + [
+            f"   {i+1}. {company}" for i, company in enumerate(companies)
+        ])
         
         try:
             choice = int(input("Select company (number): ")) - 1
@@ -351,21 +463,29 @@ class DataCoinSystem:
     
     def show_blockchain_cli(self):
         """Show blockchain information via CLI"""
-        print(f"\n🔗 Blockchain Information:")
-        print(f"   Total Blocks: {len(self.blockchain.chain)}")
+        lines = ["", "🔗 Blockchain Information:", f"   Total Blocks: {len(self.blockchain.chain)}"]
         
         if len(self.blockchain.chain) > 1:
             latest_block = self.blockchain.get_latest_block()
-            print(f"   Latest Block Hash: {latest_block.hash}")
-            print(f"   Latest Block Transactions: {len(latest_block.transactions)}")
-            print(f"   Latest Block Timestamp: {datetime.fromtimestamp(latest_block.timestamp)}")
+            lines.append(f"   Latest Block Hash: {latest_block.hash}")
+            lines.append(f"   Latest Block Transactions: {len(latest_block.transactions)}")
+            lines.append(f"   Latest Block Timestamp: {latest_block.timestamp_str}")
         
         if self.blockchain.pending_transactions:
-            print(f"   Pending Transactions: {len(self.blockchain.pending_transactions)}")
+            lines.append(f"   Pending Transactions: {len(self.blockchain.pending_transactions)}")
         
-        print(f"   Blockchain Valid: {self.blockchain.is_chain_valid()}")
+        lines.append(f"   Blockchain Valid: {self.blockchain.is_chain_valid()}")
+        self._write_lines(lines)
+    
+    def fsck_cli(self):
+        """Fully re-validate the blockchain via CLI"""
+        print(f"🔍 Checking {len(self.blockchain.chain)} blocks...")
+        if self.blockchain.is_chain_valid(full=True):
+            print("✅ Blockchain is valid")
+        else:
+            print("❌ Blockchain is invalid")
     
-    def start_api_server(self, open_browser=False):
+    def start_api_server(self, open_browser=False, workers=1, access_log=False):
         """Start the FastAPI server"""
         print("🚀 Starting DataCoin API server...")
         
@@ -377,23 +497,47 @@ class DataCoinSystem:
                     webbrowser.open('http://localhost:8000')
                     webbrowser.open('http://localhost:8000/docs')  # API docs
                     # Open frontend
-                    frontend_path = os.path.join(os.path.dirname(__file__), 'frontend', 'index.html')
-                    if os.path.exists(frontend_path):
-                        webbrowser.open(f'file://{os.path.abspath(frontend_path)}')
+                    if _FRONTEND_URL:
+                        webbrowser.open(_FRONTEND_URL)
                 except Exception as e:
                     print(f"⚠️ Could not open browser: {e}")
             
             threading.Thread(target=open_browser_delayed, daemon=True).start()
         
+        import uvicorn
+        loop, http = _select_server_backends()
+        
+        if workers > 1:
+            # Each worker process imports the app itself and holds its own
+            # in-memory blockchain, so pass the import string instead of the app
+            uvicorn.run(
+                "api.main:app",
+                host="0.0.0.0",
+                port=8000,
+                log_level="info",
+                access_log=access_log,
+                loop=loop,
+                http=http,
+                workers=workers
+            )
+            return
+        
+        # The API module builds its own services and pulls in FastAPI, so only
+        # import it on the paths that actually serve HTTP
+        from api.main import app
+        
         # Configure uvicorn
         config = uvicorn.Config(
             app,
             host="0.0.0.0",
             port=8000,
             log_level="info",
-            access_log=True
+            access_log=access_log,
+            loop=loop,
+            http=http
         )
         
+        # Server.run() installs the selected loop policy before entering asyncio.run()
         server = uvicorn.Server(config)
         server.run()
 
@@ -408,6 +552,8 @@ Examples:
     python main.py --interactive        # Interactive CLI
     python main.py --api-only           # API server only
     python main.py --web                # Start with web interface
+    python main.py --demo --miner cuda  # Mine on the GPU
+    python main.py --api-only --workers 4  # API server on 4 processes
         """
     )
     
@@ -415,16 +561,30 @@ Examples:
     parser.add_argument('--api-only', action='store_true', help='Start only the API server')
     parser.add_argument('--interactive', action='store_true', help='Start interactive CLI')
     parser.add_argument('--web', action='store_true', help='Open web interface after starting API')
+    parser.add_argument('--miner', choices=MINING_BACKENDS, default='auto',
+                        help='Proof-of-work backend: auto (SHA-NI, then CUDA, then Numba, then hashlib), cuda or cpu')
+    parser.add_argument('--mining-workers', type=int, default=1,
+                        help='Processes to shard single-core CPU mining over (default: 1)')
+    parser.add_argument('--workers', type=int, default=1,
+                        help='Number of API server processes with --api-only (each keeps its own in-memory chain)')
+    parser.add_argument('--access-log', action='store_true',
+                        help='Log every API request (off by default for throughput)')
     
     args = parser.parse_args()
     
-    # If no arguments provided, show help and start web interface
-    if not any(vars(args).values()):
+    # If no mode provided, start web interface
+    if not (args.demo or args.api_only or args.interactive or args.web):
         args.web = True
     
+    # Other modes share this process's state with the server, so they stay single-process
+    if args.workers > 1 and not args.api_only:
+        print("⚠️ --workers only applies with --api-only; ignoring it")
+        args.workers = 1
+    
+    system = None
     try:
         # Initialize system
-        system = DataCoinSystem()
+        system = DataCoinSystem(miner=args.miner, mining_workers=args.mining_workers)
         
         if args.demo:
             print("\n🎭 Running DataCoin demonstration...")
@@ -433,25 +593,28 @@ Examples:
             print("\n🌐 Starting API server for further exploration...")
             print("📖 Visit http://localhost:8000/docs for API documentation")
             print("🖥️ Frontend available at frontend/index.html")
-            system.start_api_server(open_browser=True)
+            system.start_api_server(open_browser=True, access_log=args.access_log)
             
         elif args.interactive:
             system.interactive_cli()
             
         elif args.api_only:
-            system.start_api_server(open_browser=False)
+            system.start_api_server(open_browser=False, workers=args.workers, access_log=args.access_log)
             
         elif args.web:
             print("🌐 Starting DataCoin with web interface...")
             print("📖 API docs: http://localhost:8000/docs")
             print("🖥️ Web interface will open automatically")
-            system.start_api_server(open_browser=True)
+            system.start_api_server(open_browser=True, access_log=args.access_log)
             
     except KeyboardInterrupt:
         print("\n👋 DataCoin system stopped")
     except Exception as e:
         print(f"❌ Error: {e}")
         sys.exit(1)
+    finally:
+        if system:
+            system.close()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
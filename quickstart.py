@@ -6,10 +6,19 @@ This script tests the basic functionality of the DataCoin system
 and provides a quick demonstration of core features.
 """
 
+import os
 import sys
 import time
 import traceback
 
+# Tracebacks are noisy on the expected failure paths; opt in with DATACOIN_VERBOSE=1
+VERBOSE = bool(os.environ.get("DATACOIN_VERBOSE"))
+
+def print_traceback():
+    """Print the current exception's traceback in verbose mode"""
+    if VERBOSE:
+        traceback.print_exc()
+
 def test_imports():
     """Test that all required modules can be imported"""
     print("🔍 Testing imports...")
@@ -59,7 +68,7 @@ def test_blockchain():
         return True
     except Exception as e:
         print(f"❌ Blockchain test failed: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_wallet():
@@ -84,7 +93,7 @@ def test_wallet():
         return True
     except Exception as e:
         print(f"❌ Wallet test failed: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_data_conversion():
@@ -108,7 +117,7 @@ def test_data_conversion():
         return True
     except Exception as e:
         print(f"❌ Data conversion test failed: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def test_complete_flow():
@@ -174,7 +183,7 @@ def test_complete_flow():
         return True
     except Exception as e:
         print(f"❌ Complete flow test failed: {e}")
-        traceback.print_exc()
+        print_traceback()
         return False
 
 def main():
@@ -192,18 +201,26 @@ def main():
     
     passed = 0
     failed = 0
+    skipped = 0
     
     start_time = time.time()
     
-    for test_name, test_func in tests:
+    # Later tests build on earlier ones, so stop at the first failure instead of
+    # letting it cascade through every remaining test
+    for index, (test_name, test_func) in enumerate(tests):
         try:
-            if test_func():
-                passed += 1
-            else:
-                failed += 1
+            ok = test_func()
         except Exception as e:
             print(f"❌ {test_name} test encountered an error: {e}")
+            print_traceback()
+            ok = False
+        
+        if ok:
+            passed += 1
+        else:
             failed += 1
+            skipped = len(tests) - index - 1
+            break
     
     end_time = time.time()
     
@@ -211,6 +228,8 @@ def main():
     print(f"🏁 Test Results:")
     print(f"   ✅ Passed: {passed}")
     print(f"   ❌ Failed: {failed}")
+    if skipped:
+        print(f"   ⏭️ Skipped: {skipped}")
     print(f"   ⏱️ Total time: {end_time - start_time:.2f} seconds")
     
     if failed == 0:
@@ -223,6 +242,8 @@ def main():
         return 0
     else:
         print(f"\n⚠️ {failed} test(s) failed. Please check the errors above.")
+        if not VERBOSE:
+            print("   Set DATACOIN_VERBOSE=1 to include tracebacks.")
         print("\n💡 Common solutions:")
         print("   1. Install dependencies: pip install -r requirements.txt")
         print("   2. Check Python version: python --version (requires 3.8+)")
@@ -1,4 +1,4 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
 
 with open("README.md", "r", encoding="utf-8") as fh:
     long_description = fh.read()
@@ -16,6 +16,10 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/datacoin/datacoin",
     packages=find_packages(),
+    # Native SHA-NI / ARMv8 nonce search; optional, mining falls back to Python without it
+    ext_modules=[
+        Extension("blockchain._sha256ni", sources=["blockchain/_sha256ni.c"], optional=True),
+    ],
     classifiers=[
         "Development Status :: 4 - Beta",
         "Intended Audience :: Developers",
@@ -2,42 +2,142 @@ import hashlib
 import json
 import os
 from cryptography.hazmat.primitives import hashes, serialization
-from cryptography.hazmat.primitives.asymmetric import rsa, padding
+from cryptography.hazmat.primitives.asymmetric import ed25519, rsa, padding
 from cryptography.hazmat.backends import default_backend
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional, Tuple
 import base64
 import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 
 from blockchain.core import Transaction, Blockchain
 
+KEY_TYPES = ('ed25519', 'rsa')
+
+_DIR_CHECKED = False
+
+def _ensure_data_directory():
+    """Create the wallet data directory once per process"""
+    global _DIR_CHECKED
+    if _DIR_CHECKED:
+        return
+    os.makedirs("wallet/data", exist_ok=True)
+    _DIR_CHECKED = True
+
 class Wallet:
-    def __init__(self, wallet_name: str = None):
+    # Hot statements, compiled once per connection through its statement cache
+    _SQL_INSERT_TX = '''
+        INSERT OR REPLACE INTO transactions
+        (tx_id, sender, recipient, amount, data_value, tx_type, timestamp)
+        VALUES (?, ?, ?, ?, ?, ?, ?)
+    '''
+    _SQL_SELECT_HISTORY = '''
+        SELECT tx_id, sender, recipient, amount, data_value, tx_type, timestamp, status
+        FROM transactions
+        ORDER BY timestamp DESC
+        LIMIT ? OFFSET ?
+    '''
+    _SQL_COUNT_TX = 'SELECT COUNT(*) FROM transactions'
+    # Every insert or replace takes a new, larger id, so the max id versions the table
+    _SQL_HISTORY_VERSION = 'SELECT MAX(id) FROM transactions'
+    _SQL_STATS = '''
+        SELECT COUNT(*),
+               COALESCE(SUM(CASE WHEN sender = ? THEN amount END), 0),
+               COALESCE(SUM(CASE WHEN recipient = ? THEN amount END), 0),
+               COALESCE(SUM(CASE WHEN tx_type = 'data_conversion' THEN data_value END), 0)
+        FROM transactions
+    '''
+    _SQL_UPSERT_INFO = 'INSERT OR REPLACE INTO wallet_info (key, value) VALUES (?, ?)'
+    _SQL_SELECT_INFO = 'SELECT key, value FROM wallet_info'
+    
+    def __init__(self, wallet_name: str = None, key_type: str = 'ed25519', create: bool = True):
+        if key_type not in KEY_TYPES:
+            raise ValueError(f"Unsupported key type: {key_type}")
+        
         self.wallet_name = wallet_name or f"wallet_{int(datetime.now().timestamp())}"
+        self.key_type = key_type
         self.private_key = None
         self.public_key = None
         self.address = None
+        # Full history keyed by the table's max id; None until first read
+        self._history_cache: Optional[Tuple[Optional[int], List[Dict]]] = None
         self.transactions_history: List[Dict] = []
         self.blockchain: Optional[Blockchain] = None
         
         # Initialize wallet database
-        self.db_path = f"wallet/data/{self.wallet_name}.db"
+        self.db_path = self._db_path(self.wallet_name)
         self._ensure_directory()
+        # Checked before connecting, which creates the file
+        existed = os.path.exists(self.db_path)
+        # One connection per wallet, shared by the API's worker threads under _db_lock
+        self._db_lock = threading.RLock()
+        self._conn = self._connect()
         self._init_database()
-        
-        # Generate keys if new wallet
-        if not self._load_existing_wallet():
-            self._generate_keys()
-            self._save_wallet()
+        self._load_or_create(create, existed)
+    
+    @classmethod
+    def open(cls, wallet_name: str, key_type: str = 'ed25519', create: bool = False) -> 'Wallet':
+        """Open a wallet by name, creating it only when create is set"""
+        if not create and not os.path.exists(cls._db_path(wallet_name)):
+            raise FileNotFoundError(f"Wallet {wallet_name} does not exist")
+        return cls(wallet_name, key_type, create)
+    
+    @staticmethod
+    def _db_path(wallet_name: str) -> str:
+        """Path of a wallet's database file"""
+        return f"wallet/data/{wallet_name}.db"
+    
+    def _load_or_create(self, create: bool, existed: bool):
+        """Load the stored keys, generating new ones only for a wallet being created"""
+        # A database file that did not exist before has no keys to look up
+        if existed and self._load_existing_wallet():
+            return
+        if not create:
+            self.close()
+            raise ValueError(f"Wallet {self.wallet_name} has no stored keys")
+        self._generate_keys()
+        self._save_wallet()
     
     def _ensure_directory(self):
         """Ensure wallet data directory exists"""
-        os.makedirs("wallet/data", exist_ok=True)
+        _ensure_data_directory()
+    
+    def _connect(self) -> sqlite3.Connection:
+        """Open the wallet database in autocommit mode with performance pragmas"""
+        conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False, cached_statements=256
+        )
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA synchronous=NORMAL')  # WAL only needs to sync at checkpoints
+        conn.execute('PRAGMA busy_timeout=5000')
+        conn.execute('PRAGMA temp_store=MEMORY')
+        conn.execute('PRAGMA cache_size=-20000')  # ~20 MB page cache
+        return conn
+    
+    @contextmanager
+    def _transaction(self):
+        """Run a group of writes as one explicit transaction"""
+        with self._db_lock:
+            self._conn.execute('BEGIN')
+            try:
+                yield self._conn
+            except BaseException:
+                self._conn.execute('ROLLBACK')
+                raise
+            self._conn.execute('COMMIT')
+    
+    def close(self):
+        """Close the wallet's database connection"""
+        with self._db_lock:
+            self._conn.close()
     
     def _init_database(self):
         """Initialize wallet database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._conn.cursor()
+        # WAL is persistent in the database file, so it is set once here
+        cursor.execute('PRAGMA journal_mode=WAL')
         
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS transactions (
@@ -60,96 +160,118 @@ class Wallet:
             )
         ''')
         
-        conn.commit()
-        conn.close()
+        # Index for the history ordering; the stats query is a single scan and needs none
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_tx_ts ON transactions(timestamp DESC)')
+        # Per-column indexes from the old per-filter stats queries only slow down inserts
+        for index in ('idx_tx_sender', 'idx_tx_recipient', 'idx_tx_type'):
+            cursor.execute(f'DROP INDEX IF EXISTS {index}')
     
     def _generate_keys(self):
-        """Generate RSA key pair for wallet"""
-        self.private_key = rsa.generate_private_key(
-            public_exponent=65537,
-            key_size=2048,
-            backend=default_backend()
-        )
+        """Generate the wallet key pair (Ed25519 by default, RSA for legacy wallets)"""
+        if self.key_type == 'rsa':
+            self.private_key = rsa.generate_private_key(
+                public_exponent=65537,
+                key_size=2048,
+                backend=default_backend()
+            )
+        else:
+            self.private_key = ed25519.Ed25519PrivateKey.generate()
         self.public_key = self.private_key.public_key()
         
-        # Generate wallet address from public key
-        public_pem = self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
-        )
-        
-        # Create address hash
-        address_hash = hashlib.sha256(public_pem).hexdigest()
-        self.address = f"DC{address_hash[:32]}"  # DC prefix for DataCoin
+        # 16-byte BLAKE2b fingerprint of the public key
+        address_hash = hashlib.blake2b(self._address_source(), digest_size=16).hexdigest()
+        self.address = f"DC{address_hash}"  # DC prefix for DataCoin
     
-    def _save_wallet(self):
-        """Save wallet to database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Serialize keys
-        private_pem = self.private_key.private_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PrivateFormat.PKCS8,
+    def _address_source(self) -> bytes:
+        """Bytes hashed into the address: the raw key for Ed25519, the PEM for RSA"""
+        if self.key_type == 'rsa':
+            return self.public_key.public_bytes(
+                encoding=serialization.Encoding.PEM,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+        return self._public_bytes()
+    
+    def address_v1_from_legacy(self) -> str:
+        """Recompute the SHA-256 address used by wallets created before BLAKE2b addresses"""
+        return f"DC{hashlib.sha256(self._address_source()).digest()[:16].hex()}"
+    
+    def _private_bytes(self) -> bytes:
+        """Serialize the private key: raw 32 bytes for Ed25519, PKCS8 DER for RSA"""
+        if self.key_type == 'rsa':
+            return self.private_key.private_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PrivateFormat.PKCS8,
+                encryption_algorithm=serialization.NoEncryption()
+            )
+        return self.private_key.private_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PrivateFormat.Raw,
             encryption_algorithm=serialization.NoEncryption()
         )
-        
-        public_pem = self.public_key.public_bytes(
-            encoding=serialization.Encoding.PEM,
-            format=serialization.PublicFormat.SubjectPublicKeyInfo
+    
+    def _public_bytes(self) -> bytes:
+        """Serialize the public key: raw 32 bytes for Ed25519, SubjectPublicKeyInfo DER for RSA"""
+        if self.key_type == 'rsa':
+            return self.public_key.public_bytes(
+                encoding=serialization.Encoding.DER,
+                format=serialization.PublicFormat.SubjectPublicKeyInfo
+            )
+        return self.public_key.public_bytes(
+            encoding=serialization.Encoding.Raw,
+            format=serialization.PublicFormat.Raw
         )
-        
-        # Save wallet info
+    
+    def _save_wallet(self):
+        """Save wallet to database"""
+        # Save wallet info; keys are bound as bytes and stored as BLOBs
         wallet_data = [
             ('wallet_name', self.wallet_name),
             ('address', self.address),
-            ('private_key', base64.b64encode(private_pem).decode()),
-            ('public_key', base64.b64encode(public_pem).decode())
+            ('key_type', self.key_type),
+            ('private_key', self._private_bytes()),
+            ('public_key', self._public_bytes())
         ]
         
-        cursor.executemany(
-            'INSERT OR REPLACE INTO wallet_info (key, value) VALUES (?, ?)',
-            wallet_data
-        )
-        
-        conn.commit()
-        conn.close()
+        with self._transaction() as conn:
+            conn.executemany(self._SQL_UPSERT_INFO, wallet_data)
     
     def _load_existing_wallet(self) -> bool:
         """Load existing wallet from database"""
-        if not os.path.exists(self.db_path):
-            return False
-        
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('SELECT key, value FROM wallet_info')
-        wallet_data = dict(cursor.fetchall())
+        with self._db_lock:
+            wallet_data = dict(self._conn.execute(self._SQL_SELECT_INFO).fetchall())
         
         if 'private_key' not in wallet_data:
-            conn.close()
             return False
         
         # Load keys
         try:
-            private_pem = base64.b64decode(wallet_data['private_key'])
-            self.private_key = serialization.load_pem_private_key(
-                private_pem, password=None, backend=default_backend()
-            )
+            private_bytes = wallet_data['private_key']
+            if isinstance(private_bytes, str):
+                # Wallets saved before BLOB storage hold base64 text
+                private_bytes = base64.b64decode(private_bytes)
             
-            public_pem = base64.b64decode(wallet_data['public_key'])
-            self.public_key = serialization.load_pem_public_key(
-                public_pem, backend=default_backend()
-            )
+            if len(private_bytes) == 32:
+                self.private_key = ed25519.Ed25519PrivateKey.from_private_bytes(private_bytes)
+            elif private_bytes.startswith(b'-----'):
+                # Older wallets stored PEM
+                self.private_key = serialization.load_pem_private_key(
+                    private_bytes, password=None, backend=default_backend()
+                )
+            else:
+                self.private_key = serialization.load_der_private_key(
+                    private_bytes, password=None, backend=default_backend()
+                )
+            self.public_key = self.private_key.public_key()
             
-            self.address = wallet_data['address']
+            # Wallets saved before Ed25519 became the default are RSA
+            self.key_type = wallet_data.get('key_type', 'rsa')
+            # Stored addresses are kept as-is; old wallets without one used the SHA-256 form
+            self.address = wallet_data.get('address') or self.address_v1_from_legacy()
             self.wallet_name = wallet_data['wallet_name']
             
-            conn.close()
             return True
         except Exception as e:
             print(f"Error loading wallet: {e}")
-            conn.close()
             return False
     
     def connect_to_blockchain(self, blockchain: Blockchain):
@@ -169,8 +291,9 @@ class Wallet:
             return None
         
         # Check balance
-        if self.get_balance() < amount:
-            print(f"Insufficient balance. Current: {self.get_balance()}, Required: {amount}")
+        balance = self.get_balance()
+        if balance < amount:
+            print(f"Insufficient balance. Current: {balance}, Required: {amount}")
             return None
         
         # Create transaction
@@ -183,61 +306,100 @@ class Wallet:
         
         # Add to blockchain
         if self.blockchain.add_transaction(transaction):
-            self._record_transaction(transaction)
+            self.record_transactions([transaction])
             return transaction
         else:
             print("Failed to add transaction to blockchain")
             return None
     
-    def _record_transaction(self, transaction: Transaction):
-        """Record transaction in wallet database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            INSERT OR REPLACE INTO transactions 
-            (tx_id, sender, recipient, amount, data_value, tx_type, timestamp)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            transaction.tx_id,
-            transaction.sender,
-            transaction.recipient,
-            transaction.amount,
-            transaction.data_value,
-            transaction.tx_type,
-            transaction.timestamp
-        ))
+    def create_transactions(self, recipients: List[Tuple[str, float, str]]) -> List[Transaction]:
+        """Create several transactions with a single balance check and database write"""
+        if not self.blockchain:
+            print("Wallet not connected to blockchain")
+            return []
         
-        conn.commit()
-        conn.close()
-    
-    def get_transaction_history(self) -> List[Dict]:
-        """Get transaction history for this wallet"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT tx_id, sender, recipient, amount, data_value, tx_type, timestamp, status
-            FROM transactions
-            ORDER BY timestamp DESC
-        ''')
+        # Check balance once against the combined amount
+        balance = self.get_balance()
+        required = sum(amount for _, amount, _ in recipients)
+        if balance < required:
+            print(f"Insufficient balance. Current: {balance}, Required: {required}")
+            return []
         
         transactions = []
-        for row in cursor.fetchall():
-            transactions.append({
-                'tx_id': row[0],
-                'sender': row[1],
-                'recipient': row[2],
-                'amount': row[3],
-                'data_value': row[4],
-                'tx_type': row[5],
-                'timestamp': row[6],
-                'status': row[7]
-            })
+        for recipient, amount, tx_type in recipients:
+            transaction = Transaction(
+                sender=self.address,
+                recipient=recipient,
+                amount=amount,
+                tx_type=tx_type
+            )
+            
+            if self.blockchain.add_transaction(transaction):
+                transactions.append(transaction)
+            else:
+                print("Failed to add transaction to blockchain")
         
-        conn.close()
+        self.record_transactions(transactions)
         return transactions
     
+    def _record_transaction(self, transaction: Transaction):
+        """Record transaction in wallet database"""
+        self.record_transactions([transaction])
+    
+    def record_transactions(self, transactions: List[Transaction]):
+        """Record transactions in wallet database in one BEGIN ... COMMIT"""
+        if not transactions:
+            return
+        
+        with self._transaction() as conn:
+            self._history_cache = None
+            conn.executemany(self._SQL_INSERT_TX, [(
+                transaction.tx_id,
+                transaction.sender,
+                transaction.recipient,
+                transaction.amount,
+                transaction.data_value,
+                transaction.tx_type,
+                transaction.timestamp
+            ) for transaction in transactions])
+    
+    def get_transaction_history(self, limit: Optional[int] = None, offset: int = 0) -> List[Dict]:
+        """Get transaction history for this wallet, newest first, optionally one page at a time"""
+        with self._db_lock:
+            # The version check also catches rows written by other processes sharing the file
+            version = self._conn.execute(self._SQL_HISTORY_VERSION).fetchone()[0]
+            if self._history_cache is None or self._history_cache[0] != version:
+                if limit is not None:
+                    # Fetch a single page directly rather than filling the cache for it
+                    cursor = self._conn.execute(self._SQL_SELECT_HISTORY, (limit, offset))
+                    return [dict(row) for row in cursor]
+                # LIMIT -1 means no limit in SQLite
+                cursor = self._conn.execute(self._SQL_SELECT_HISTORY, (-1, 0))
+                self._history_cache = (version, [dict(row) for row in cursor])
+            history = self._history_cache[1]
+        
+        # Copy the rows so callers cannot alter the cached ones
+        return [dict(row) for row in history[offset:None if limit is None else offset + limit]]
+    
+    def iter_transaction_history(self, batch_size: int = 500) -> Iterator[Dict]:
+        """Yield transaction history newest first without loading it all at once"""
+        cursor = self._conn.cursor()
+        with self._db_lock:
+            cursor.execute(self._SQL_SELECT_HISTORY, (-1, 0))
+        while True:
+            # Take the lock per batch so other threads can use the connection in between
+            with self._db_lock:
+                rows = cursor.fetchmany(batch_size)
+            if not rows:
+                return
+            for row in rows:
+                yield dict(row)
+    
+    def count_transactions(self) -> int:
+        """Count the transactions recorded in this wallet"""
+        with self._db_lock:
+            return self._conn.execute(self._SQL_COUNT_TX).fetchone()[0]
+    
     def mine_block(self) -> bool:
         """Mine a new block and receive reward"""
         if not self.blockchain:
@@ -261,7 +423,7 @@ class Wallet:
         
         transaction = self.blockchain.convert_data_to_currency(data_size_mb, self.address)
         if transaction:
-            self._record_transaction(transaction)
+            self.record_transactions([transaction])
             print(f"Converted {data_size_mb} MB to {transaction.amount} DataCoins")
         return transaction
     
@@ -284,21 +446,21 @@ class Wallet:
             'wallet_name': self.wallet_name,
             'address': self.address,
             'balance': self.get_balance(),
-            'transaction_count': len(self.get_transaction_history())
+            'transaction_count': self.count_transactions()
         }
     
     def get_wallet_stats(self) -> Dict:
         """Get comprehensive wallet statistics"""
-        transactions = self.get_transaction_history()
-        
-        total_sent = sum(tx['amount'] for tx in transactions if tx['sender'] == self.address)
-        total_received = sum(tx['amount'] for tx in transactions if tx['recipient'] == self.address)
-        data_converted = sum(tx['data_value'] for tx in transactions if tx['tx_type'] == 'data_conversion')
+        # Aggregate in one SQL pass so the history never has to be loaded into Python
+        with self._db_lock:
+            total_transactions, total_sent, total_received, data_converted = self._conn.execute(
+                self._SQL_STATS, (self.address, self.address)
+            ).fetchone()
         
         return {
             'address': self.address,
             'balance': self.get_balance(),
-            'total_transactions': len(transactions),
+            'total_transactions': total_transactions,
             'total_sent': total_sent,
             'total_received': total_received,
             'data_converted_mb': data_converted,
@@ -314,44 +476,61 @@ class WalletManager:
     
     def _ensure_directory(self):
         """Ensure wallet directory exists"""
-        os.makedirs("wallet/data", exist_ok=True)
+        _ensure_data_directory()
     
-    def create_wallet(self, wallet_name: str) -> Wallet:
+    def create_wallet(self, wallet_name: str, key_type: str = 'ed25519') -> Wallet:
         """Create a new wallet"""
         if wallet_name in self.wallets:
             print(f"Wallet {wallet_name} already exists")
             return self.wallets[wallet_name]
         
-        wallet = Wallet(wallet_name)
+        wallet = Wallet.open(wallet_name, key_type, create=True)
         self.wallets[wallet_name] = wallet
         print(f"Created new wallet: {wallet_name} with address: {wallet.address}")
         return wallet
     
+    def create_wallets(self, wallet_names: List[str], key_type: str = 'ed25519') -> List[Wallet]:
+        """Create several wallets at once, generating their keys in parallel"""
+        # Deduplicate so two threads never create the same wallet
+        unique_names = list(dict.fromkeys(wallet_names))
+        with ThreadPoolExecutor(max_workers=os.cpu_count()) as pool:
+            wallets = dict(zip(unique_names, pool.map(
+                lambda name: self.create_wallet(name, key_type), unique_names
+            )))
+        return [wallets[name] for name in wallet_names]
+    
     def load_wallet(self, wallet_name: str) -> Optional[Wallet]:
         """Load existing wallet"""
         if wallet_name in self.wallets:
             return self.wallets[wallet_name]
         
         try:
-            wallet = Wallet(wallet_name)
+            wallet = Wallet.open(wallet_name)
             self.wallets[wallet_name] = wallet
             return wallet
+        except FileNotFoundError:
+            return None
         except Exception as e:
             print(f"Failed to load wallet {wallet_name}: {e}")
             return None
     
     def list_wallets(self) -> List[str]:
         """List all available wallets"""
-        wallet_files = []
         data_dir = "wallet/data"
         
-        if os.path.exists(data_dir):
-            for file in os.listdir(data_dir):
-                if file.endswith('.db'):
-                    wallet_files.append(file.replace('.db', ''))
+        if not os.path.exists(data_dir):
+            return []
         
-        return wallet_files
+        # The -wal and -shm files WAL mode leaves beside each database do not end in .db
+        with os.scandir(data_dir) as entries:
+            return [entry.name[:-3] for entry in entries if entry.name.endswith('.db') and entry.is_file()]
     
     def get_wallet(self, wallet_name: str) -> Optional[Wallet]:
         """Get wallet by name"""
-        return self.wallets.get(wallet_name)
\ No newline at end of file
+        return self.wallets.get(wallet_name)
+    
+    def close(self):
+        """Close the database connections of all loaded wallets"""
+        for wallet in self.wallets.values():
+            wallet.close()
+        self.wallets.clear()
\ No newline at end of file